@@ -3,12 +3,65 @@
 All functions accept the clean DataFrame from data_loader.load_clean().
 """
 
+import weakref
 from datetime import datetime
 
 import numpy as np
 import pandas as pd
 
 
+# ---------------------------------------------------------------------------
+# Per-frame groupby memos
+# ---------------------------------------------------------------------------
+# Every metric call used to boolean-filter the full frame down to one
+# store before grouping. Grouping (store_slug, title) once per frame and
+# slicing by slug does one pass over the date/title columns instead.
+# Keyed by id(df); a weakref finalizer evicts entries when the frame is
+# garbage-collected so a recycled id can't serve stale results.
+
+_LAST_SEEN_MEMO: dict[int, pd.Series] = {}
+_FLAVOR_COUNT_MEMO: dict[int, pd.Series] = {}
+_PROB_MEMO: dict[tuple[int, str | None], pd.Series] = {}
+
+
+def _day_numbers(df: pd.DataFrame) -> pd.Series:
+    """Integer days-since-epoch for each row.
+
+    load_clean precomputes this as `flavor_day`; derive it for frames
+    that don't carry the column.
+    """
+    if "flavor_day" in df.columns:
+        return df["flavor_day"]
+    return pd.Series(
+        df["flavor_date"].values.astype("datetime64[D]").astype("int64"),
+        index=df.index,
+    )
+
+
+def _store_last_day(df: pd.DataFrame) -> pd.Series:
+    """(store_slug, title) -> most recent day number, memoized per frame."""
+    key = id(df)
+    memo = _LAST_SEEN_MEMO.get(key)
+    if memo is None:
+        memo = _day_numbers(df).groupby(
+            [df["store_slug"], df["title"]], observed=True
+        ).max()
+        _LAST_SEEN_MEMO[key] = memo
+        weakref.finalize(df, _LAST_SEEN_MEMO.pop, key, None)
+    return memo
+
+
+def _store_flavor_counts(df: pd.DataFrame) -> pd.Series:
+    """(store_slug, title) -> appearance count, memoized per frame."""
+    key = id(df)
+    memo = _FLAVOR_COUNT_MEMO.get(key)
+    if memo is None:
+        memo = df.groupby(["store_slug", "title"], observed=True).size()
+        _FLAVOR_COUNT_MEMO[key] = memo
+        weakref.finalize(df, _FLAVOR_COUNT_MEMO.pop, key, None)
+    return memo
+
+
 # ---------------------------------------------------------------------------
 # Frequency
 # ---------------------------------------------------------------------------
@@ -19,17 +72,28 @@ def flavor_frequency(df: pd.DataFrame, store_slug: str | None = None) -> pd.Seri
     If store_slug is given, scoped to that store; otherwise global.
     Returns Series indexed by flavor title, sorted descending.
     """
-    subset = df[df["store_slug"] == store_slug] if store_slug else df
-    return subset["title"].value_counts().sort_values(ascending=False)
+    if not store_slug:
+        return df["title"].value_counts().sort_values(ascending=False)
+    counts = _store_flavor_counts(df)
+    if store_slug not in counts.index.get_level_values(0):
+        return pd.Series(dtype="int64", name="count")
+    return counts.loc[store_slug].sort_values(ascending=False)
 
 
 def flavor_probability(df: pd.DataFrame, store_slug: str | None = None) -> pd.Series:
     """Normalized frequency — P(flavor) or P(flavor|store).
 
-    Returns Series indexed by flavor title, sums to 1.0.
+    Returns Series indexed by flavor title, sums to 1.0. Memoized per
+    (frame, store) since entropy/evenness/surprise all start from it.
     """
-    freq = flavor_frequency(df, store_slug)
-    return freq / freq.sum()
+    key = (id(df), store_slug)
+    memo = _PROB_MEMO.get(key)
+    if memo is None:
+        freq = flavor_frequency(df, store_slug)
+        memo = freq / freq.sum()
+        _PROB_MEMO[key] = memo
+        weakref.finalize(df, _PROB_MEMO.pop, key, None)
+    return memo
 
 
 # ---------------------------------------------------------------------------
@@ -48,11 +112,14 @@ def days_since_last(
     """
     if as_of is None:
         as_of = df["flavor_date"].max()
-    as_of = pd.Timestamp(as_of)
+    as_of_day = int(
+        pd.Timestamp(as_of).to_datetime64().astype("datetime64[D]").astype("int64")
+    )
 
-    store_df = df[df["store_slug"] == store_slug]
-    last_seen = store_df.groupby("title")["flavor_date"].max()
-    return (as_of - last_seen).dt.days.sort_values(ascending=False)
+    last_day = _store_last_day(df)
+    if store_slug not in last_day.index.get_level_values(0):
+        return pd.Series(dtype="int64", name="flavor_date")
+    return (as_of_day - last_day.loc[store_slug]).sort_values(ascending=False)
 
 
 def overdue_flavors(
@@ -69,59 +136,74 @@ def overdue_flavors(
         as_of = df["flavor_date"].max()
     as_of = pd.Timestamp(as_of)
 
-    store_df = df[df["store_slug"] == store_slug].sort_values("flavor_date")
+    store_df = df[df["store_slug"] == store_slug]
     recency = days_since_last(df, store_slug, as_of)
 
-    # Compute historical average gap per flavor at this store
-    avg_gaps = {}
-    for flavor, group in store_df.groupby("title"):
-        dates = group["flavor_date"].sort_values()
-        if len(dates) >= 2:
-            gaps = dates.diff().dropna().dt.days
-            avg_gaps[flavor] = gaps.mean()
-
-    records = []
-    for flavor, days in recency.items():
-        if flavor in avg_gaps and avg_gaps[flavor] > 0:
-            ratio = days / avg_gaps[flavor]
-            if ratio >= threshold:
-                records.append({
-                    "title": flavor,
-                    "days_since": days,
-                    "avg_gap": round(avg_gaps[flavor], 1),
-                    "ratio": round(ratio, 2),
-                })
-
-    if not records:
+    # Historical average gap per flavor: one sorted pass, diff within
+    # group, then a grouped mean — no per-flavor Python loop. Gaps are
+    # plain int64 day-number differences, no timedelta round trip.
+    s = store_df.sort_values(["title", "flavor_date"])
+    gaps = _day_numbers(s).groupby(s["title"], observed=True).diff()
+    avg_gaps = gaps.groupby(s["title"], observed=True).mean().dropna()
+
+    result = pd.DataFrame({"days_since": recency, "avg_gap": avg_gaps}).dropna()
+    result = result[result["avg_gap"] > 0]
+    result["ratio"] = result["days_since"] / result["avg_gap"]
+    result = result[result["ratio"] >= threshold]
+
+    if len(result) == 0:
         return pd.DataFrame(columns=["title", "days_since", "avg_gap", "ratio"])
-    return pd.DataFrame(records).sort_values("ratio", ascending=False).reset_index(drop=True)
+
+    result["avg_gap"] = result["avg_gap"].round(1)
+    result["ratio"] = result["ratio"].round(2)
+    result["days_since"] = result["days_since"].astype(int)
+    return (
+        result.rename_axis("title")
+        .reset_index()[["title", "days_since", "avg_gap", "ratio"]]
+        .sort_values("ratio", ascending=False)
+        .reset_index(drop=True)
+    )
 
 
 # ---------------------------------------------------------------------------
 # Diversity (Shannon entropy + Pielou's evenness)
 # ---------------------------------------------------------------------------
 
-def shannon_entropy(df: pd.DataFrame, store_slug: str | None = None) -> float:
+def shannon_entropy(
+    df: pd.DataFrame,
+    store_slug: str | None = None,
+    probs: pd.Series | None = None,
+) -> float:
     """Shannon entropy H of the flavor distribution (bits).
 
     Higher = more evenly distributed rotation.
     Max = log2(N_flavors) when all equally likely.
+    Pass a precomputed probability Series via `probs` to skip the lookup.
     """
-    probs = flavor_probability(df, store_slug)
-    probs = probs[probs > 0]
-    return float(-(probs * np.log2(probs)).sum())
+    if probs is None:
+        probs = flavor_probability(df, store_slug)
+    arr = probs.to_numpy()
+    arr = arr[arr > 0]
+    return float(-(arr * np.log2(arr)).sum())
 
 
-def pielou_evenness(df: pd.DataFrame, store_slug: str | None = None) -> float:
+def pielou_evenness(
+    df: pd.DataFrame,
+    store_slug: str | None = None,
+    probs: pd.Series | None = None,
+) -> float:
     """Pielou's J — entropy normalized to [0, 1].
 
     1.0 = perfectly even rotation, 0.0 = always the same flavor.
     """
-    probs = flavor_probability(df, store_slug)
-    n = len(probs[probs > 0])
+    if probs is None:
+        probs = flavor_probability(df, store_slug)
+    arr = probs.to_numpy()
+    arr = arr[arr > 0]
+    n = len(arr)
     if n <= 1:
         return 0.0
-    h = shannon_entropy(df, store_slug)
+    h = float(-(arr * np.log2(arr)).sum())
     return h / np.log2(n)
 
 
@@ -158,6 +240,7 @@ def store_summary(
     """
     store_df = df[df["store_slug"] == store_slug]
     freq = flavor_frequency(df, store_slug)
+    probs = flavor_probability(df, store_slug)
 
     overdue = overdue_flavors(df, store_slug, as_of=as_of)
 
@@ -165,8 +248,8 @@ def store_summary(
         "store_slug": store_slug,
         "unique_flavors": int(store_df["title"].nunique()),
         "total_days": len(store_df),
-        "entropy": round(shannon_entropy(df, store_slug), 3),
-        "evenness": round(pielou_evenness(df, store_slug), 3),
+        "entropy": round(shannon_entropy(df, store_slug, probs=probs), 3),
+        "evenness": round(pielou_evenness(df, store_slug, probs=probs), 3),
         "top_5_flavors": freq.head(5).to_dict(),
         "overdue_count": len(overdue),
     }
@@ -7,24 +7,77 @@ Usage:
 """
 
 import argparse
+import hashlib
 import json
+import os
+import pickle
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
 import pandas as pd
 
+try:  # Rust-backed serializer; optional, stdlib json is the fallback
+    import orjson
+except ImportError:
+    orjson = None
+
 from analytics.data_loader import load_clean, store_list
 from analytics.forecast_writer import generate_forecast_json, generate_multiday_forecast_json
 from analytics.predict import FrequencyRecencyModel
 
 
+MODEL_CACHE_DIR = Path("data/forecasts/.model_cache")
+
+
+def _df_fingerprint(df: pd.DataFrame) -> str:
+    """Stable content hash of the columns the model is fit on."""
+    hashed = pd.util.hash_pandas_object(
+        df[["store_slug", "title", "flavor_date"]], index=False
+    )
+    return hashlib.sha256(hashed.values.tobytes()).hexdigest()[:16]
+
+
+def fit_model_cached(
+    df: pd.DataFrame,
+    cache_dir: Path = MODEL_CACHE_DIR,
+    use_cache: bool = True,
+) -> FrequencyRecencyModel:
+    """Fit the forecast model, reusing a pickled fit for identical data.
+
+    The pickle excludes the DataFrame itself (it's reattached from the
+    caller's frame), so cache entries stay small and loading is cheap.
+    """
+    if not use_cache:
+        return FrequencyRecencyModel().fit(df)
+
+    path = cache_dir / f"{_df_fingerprint(df)}.pkl"
+    if path.exists():
+        with path.open("rb") as f:
+            model = pickle.load(f)
+        model.df = df
+        return model
+
+    model = FrequencyRecencyModel().fit(df)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    frame = model.df
+    model.df = None
+    try:
+        with path.open("wb") as f:
+            pickle.dump(model, f)
+    finally:
+        model.df = frame
+    return model
+
+
 def generate_all_forecasts(
     df: pd.DataFrame,
     target_date: pd.Timestamp | None = None,
     stores: list[str] | None = None,
     n_predictions: int = 10,
     n_days: int = 7,
+    model: FrequencyRecencyModel | None = None,
 ) -> dict:
     """Generate forecasts for all (or specified) stores.
 
@@ -37,26 +90,41 @@ def generate_all_forecasts(
     if stores is None:
         stores = store_list(df)
 
-    model = FrequencyRecencyModel().fit(df)
+    if model is None:
+        model = FrequencyRecencyModel().fit(df)
 
-    forecasts = {}
+    # One size pass decides eligibility for every store up front; the
+    # under-observed skip is then an O(1) lookup instead of a frame scan.
+    counts = df.groupby("store_slug", sort=False, observed=True).size()
+    eligible = []
     skipped = []
     for slug in stores:
-        store_df = df[df["store_slug"] == slug]
-        if len(store_df) < 10:
+        n_obs = int(counts.get(slug, 0))
+        if n_obs < 10:
             skipped.append(slug)
             print(
-                f"WARNING: skipping {slug} — only {len(store_df)} observations",
+                f"WARNING: skipping {slug} — only {n_obs} observations",
                 file=sys.stderr,
             )
-            continue
+        else:
+            eligible.append(slug)
+
+    def _forecast_one(slug: str) -> tuple[str, dict]:
         if n_days > 1:
             forecast = generate_multiday_forecast_json(
                 model, df, slug, target_date, n_days, n_predictions
             )
         else:
             forecast = generate_forecast_json(model, df, slug, target_date, n_predictions)
-        forecasts[slug] = forecast
+        return slug, forecast
+
+    # Stores are independent, and the heavy work per store is inside
+    # numpy/pandas which drops the GIL — fan out across cores. Threads
+    # (not processes) so the fitted model and frame are shared, not pickled.
+    forecasts = {}
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        for slug, forecast in pool.map(_forecast_one, eligible):
+            forecasts[slug] = forecast
 
     if skipped:
         print(f"Skipped {len(skipped)} stores: {', '.join(skipped)}", file=sys.stderr)
@@ -80,6 +148,8 @@ def main():
     parser.add_argument("--pretty", action="store_true", help="Pretty-print JSON")
     parser.add_argument("--days", type=int, default=7,
                         help="Number of days to forecast (default=7)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always re-fit the model instead of reusing a cached fit")
     args = parser.parse_args()
 
     print("Loading data...", file=sys.stderr)
@@ -90,9 +160,11 @@ def main():
     target_date = pd.Timestamp(args.date) if args.date else None
     stores = [args.store] if args.store else None
 
+    model = fit_model_cached(df, use_cache=not args.no_cache)
+
     print(f"Generating {args.days}-day forecasts...", file=sys.stderr)
     result = generate_all_forecasts(
-        df, target_date=target_date, stores=stores, n_days=args.days
+        df, target_date=target_date, stores=stores, n_days=args.days, model=model
     )
     print(f"Generated {result['n_stores']} forecasts for {result['target_date']}",
           file=sys.stderr)
@@ -103,8 +175,17 @@ def main():
 
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    indent = 2 if args.pretty else None
-    output_path.write_text(json.dumps(result, indent=indent))
+    if orjson is not None:
+        output_path.write_bytes(
+            orjson.dumps(result, option=orjson.OPT_INDENT_2 if args.pretty else 0)
+        )
+    else:
+        indent = 2 if args.pretty else None
+        # Stream straight to the file — json.dumps would materialize the
+        # whole multi-MB document as an intermediate string first.
+        with output_path.open("w") as f:
+            json.dump(result, f, indent=indent,
+                      separators=(",", ":") if indent is None else None)
     print(f"Written to {output_path}", file=sys.stderr)
 
     if result["forecasts"]:
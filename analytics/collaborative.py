@@ -4,14 +4,19 @@ The portfolio centerpiece: Culver's stores are "users", flavors are "items".
 NMF discovers latent "taste profiles" and clusters stores by scheduling behavior.
 """
 
+import functools
 import json
 from pathlib import Path
+from typing import Literal
 
 import numpy as np
 import pandas as pd
-from sklearn.decomposition import NMF
+from scipy import sparse
+from sklearn.decomposition import NMF, MiniBatchNMF
 from sklearn.cluster import KMeans
 
+from analytics.data_loader import category_codes
+
 STORES_JSON = Path(__file__).resolve().parent.parent / "docs" / "stores.json"
 
 
@@ -26,11 +31,27 @@ def store_flavor_matrix(df: pd.DataFrame, normalize_rows: bool = True) -> pd.Dat
     If normalize_rows=True, each row is L1-normalized (sums to 1.0) so stores
     with more data don't dominate.
     """
-    ct = pd.crosstab(df["store_slug"], df["title"])
+    # groupby().size().unstack() over categorical codes — same result as
+    # pd.crosstab without the pivot_table machinery it routes through.
+    ct = (
+        df.assign(
+            store_slug=df["store_slug"].astype("category"),
+            title=df["title"].astype("category"),
+        )
+        .groupby(["store_slug", "title"], observed=True, sort=True)
+        .size()
+        .unstack(fill_value=0)
+    )
+    ct.index = ct.index.astype(object)
+    ct.columns = ct.columns.astype(object)
+    ct = ct.rename_axis(index="store_slug", columns="title")
     if normalize_rows:
-        row_sums = ct.sum(axis=1)
-        row_sums = row_sums.replace(0, 1)
-        ct = ct.div(row_sums, axis=0)
+        # In-place numpy divide — one float32 allocation instead of the
+        # replace/div/reindex chain, and FP32 feeds NMF/KMeans natively.
+        arr = ct.values.astype(np.float32)
+        row_sums = arr.sum(axis=1)
+        np.divide(arr, row_sums[:, None], out=arr, where=row_sums[:, None] > 0)
+        ct = pd.DataFrame(arr, index=ct.index, columns=ct.columns)
     return ct
 
 
@@ -42,16 +63,31 @@ def nmf_decompose(
     matrix: pd.DataFrame,
     n_components: int = 6,
     random_state: int = 42,
+    method: Literal["full", "minibatch"] = "full",
 ) -> tuple[pd.DataFrame, pd.DataFrame, NMF]:
     """Non-negative Matrix Factorization of the store×flavor matrix.
 
+    method="minibatch" swaps in MiniBatchNMF, which converges in streamed
+    batches instead of full passes — the right trade once the matrix grows
+    to thousands of stores. Mostly-zero matrices are handed to sklearn as
+    CSR so memory and flops scale with the nonzeros.
+
     Returns:
         W: stores × components (store latent profiles)
         H: components × flavors (latent flavor profiles)
         model: fitted NMF model
     """
-    model = NMF(n_components=n_components, random_state=random_state, max_iter=1000)
-    W = model.fit_transform(matrix.values)
+    if method == "minibatch":
+        model = MiniBatchNMF(n_components=n_components, random_state=random_state,
+                             batch_size=256, max_iter=200)
+    else:
+        model = NMF(n_components=n_components, random_state=random_state, max_iter=1000)
+
+    values = matrix.values
+    density = np.count_nonzero(values) / values.size if values.size else 1.0
+    if density < 0.2:
+        values = sparse.csr_matrix(values)
+    W = model.fit_transform(values)
     H = model.components_
 
     W_df = pd.DataFrame(W, index=matrix.index,
@@ -66,11 +102,19 @@ def factor_top_flavors(H: pd.DataFrame, n: int = 5) -> dict[str, list[str]]:
 
     Returns dict mapping factor name → list of flavor titles.
     """
-    result = {}
-    for factor in H.index:
-        top = H.loc[factor].sort_values(ascending=False).head(n)
-        result[factor] = top.index.tolist()
-    return result
+    # One argpartition over the whole K×F matrix, then an exact sort of
+    # just the n winners per row — no per-factor .loc/sort_values.
+    A = H.values
+    k = min(n, A.shape[1])
+    top_idx = np.argpartition(-A, k - 1, axis=1)[:, :k]
+    rows = np.arange(A.shape[0])[:, None]
+    top_idx = top_idx[rows, np.argsort(-A[rows, top_idx], axis=1)]
+
+    flavor_names = H.columns.to_numpy()
+    return {
+        factor: flavor_names[top_idx[i]].tolist()
+        for i, factor in enumerate(H.index)
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -100,14 +144,40 @@ def cluster_summary(
 
     Returns dict mapping cluster_id → {size, top_flavors, example_stores}.
     """
+    # One merge + grouped count over the whole frame instead of a
+    # per-cluster isin() scan — O(N) total rather than O(clusters × N).
+    cluster_df = clusters.rename("cluster").reset_index()
+    idx_col = cluster_df.columns[0]
+    if idx_col != "store_slug":
+        cluster_df = cluster_df.rename(columns={idx_col: "store_slug"})
+    merged = df[["store_slug", "title"]].merge(cluster_df, on="store_slug", how="inner")
+
+    # Counting on integer codes: one bincount over linearized
+    # (cluster, title) pairs replaces the hash-based grouped count.
+    title_codes, title_cats = category_codes(merged, "title")
+    cluster_codes, cluster_ids = pd.factorize(merged["cluster"])
+    n_titles = len(title_cats)
+    counts = np.bincount(
+        cluster_codes * n_titles + title_codes,
+        minlength=len(cluster_ids) * n_titles,
+    ).reshape(-1, n_titles)
+
+    titles_arr = np.asarray(title_cats)
+    top_map = {}
+    for ci, cluster_id in enumerate(cluster_ids):
+        row = counts[ci]
+        k = min(n_top_flavors, n_titles)
+        top = np.argpartition(-row, k - 1)[:k]
+        top = top[np.argsort(-row[top], kind="stable")]
+        top = top[row[top] > 0]
+        top_map[cluster_id] = titles_arr[top].tolist()
+
     result = {}
     for cluster_id in sorted(clusters.unique()):
-        stores_in_cluster = clusters[clusters == cluster_id].index.tolist()
-        cluster_df = df[df["store_slug"].isin(stores_in_cluster)]
-        top_flavors = cluster_df["title"].value_counts().head(n_top_flavors).index.tolist()
+        stores_in_cluster = clusters.index[clusters == cluster_id].tolist()
         result[cluster_id] = {
             "size": len(stores_in_cluster),
-            "top_flavors": top_flavors,
+            "top_flavors": top_map.get(cluster_id, []),
             "example_stores": stores_in_cluster[:5],
         }
     return result
@@ -117,15 +187,24 @@ def cluster_summary(
 # Geographic mapping
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=1)
+def _load_locations_cached() -> pd.DataFrame:
+    """Parse docs/stores.json once per process."""
+    with open(STORES_JSON) as f:
+        data = json.load(f)
+    df = pd.DataFrame(data["stores"], columns=["slug", "name", "city", "state", "lat", "lng"])
+    df["lat"] = df["lat"].astype(np.float32)
+    df["lng"] = df["lng"].astype(np.float32)
+    return df
+
+
 def load_store_locations() -> pd.DataFrame:
     """Load store lat/lng from docs/stores.json.
 
-    Returns DataFrame: slug, name, city, state, lat, lng.
+    Returns DataFrame: slug, name, city, state, lat, lng. The JSON is
+    parsed once and cached; repeated calls share the same frame.
     """
-    with open(STORES_JSON) as f:
-        data = json.load(f)
-    stores = data["stores"]
-    return pd.DataFrame(stores)
+    return _load_locations_cached()
 
 
 def cluster_geo_summary(
@@ -146,15 +225,24 @@ def cluster_geo_summary(
         cluster_df = cluster_df.rename(columns={idx_col: "slug"})
     merged = locations.merge(cluster_df, on="slug", how="inner")
 
+    # Aggregate means once and round per column, rather than per record.
+    agg = merged.groupby("cluster").agg(
+        n_stores=("slug", "size"),
+        mean_lat=("lat", "mean"),
+        mean_lng=("lng", "mean"),
+    )
+    agg[["mean_lat", "mean_lng"]] = agg[["mean_lat", "mean_lng"]].astype(np.float64).round(4)
+
     records = []
     for cluster_id, group in merged.groupby("cluster"):
         top_states = group["state"].value_counts().head(3)
         state_str = ", ".join(f"{s}({n})" for s, n in top_states.items())
+        row = agg.loc[cluster_id]
         records.append({
             "cluster": int(cluster_id),
-            "n_stores": len(group),
-            "mean_lat": round(group["lat"].mean(), 4),
-            "mean_lng": round(group["lng"].mean(), 4),
+            "n_stores": int(row["n_stores"]),
+            "mean_lat": float(row["mean_lat"]),
+            "mean_lng": float(row["mean_lng"]),
             "top_states": state_str,
         })
 
@@ -10,6 +10,7 @@ import sqlite3
 import warnings
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 DEFAULT_DB = Path(__file__).resolve().parent.parent / "data" / "backfill" / "flavors.sqlite"
@@ -56,6 +57,11 @@ def load_clean(db_path: Path | str = DEFAULT_DB) -> pd.DataFrame:
 
     df = df[~df["title"].isin(CLOSED_MARKERS)].copy()
 
+    # Categoricals: every metric filters/groups on these two columns, and
+    # integer code comparisons move far less memory than string equality.
+    df["store_slug"] = df["store_slug"].astype("category")
+    df["title"] = df["title"].astype("category")
+
     # O11: Freshness check — warn if newest record is more than 7 days old
     if len(df) > 0:
         newest = df["flavor_date"].max()
@@ -70,9 +76,27 @@ def load_clean(db_path: Path | str = DEFAULT_DB) -> pd.DataFrame:
     df["dow"] = df["flavor_date"].dt.dayofweek  # 0=Mon, 6=Sun
     df["month"] = df["flavor_date"].dt.month
     df["year"] = df["flavor_date"].dt.year
+    # Integer days-since-epoch: recency math subtracts these directly
+    # instead of building timedelta arrays and going through .dt.days
+    df["flavor_day"] = df["flavor_date"].values.astype("datetime64[D]").astype("int64")
     return df.reset_index(drop=True)
 
 
+def category_codes(df: pd.DataFrame, col: str) -> tuple[np.ndarray, pd.Index]:
+    """Integer codes plus their label index for a column.
+
+    Categorical columns (the load_clean default) hand back their existing
+    codes without re-hashing any strings; plain object columns fall back
+    to a one-off factorize. Metrics that only compare or count labels can
+    work on the codes and map back at the end.
+    """
+    s = df[col]
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return s.cat.codes.to_numpy(), s.cat.categories
+    codes, uniques = pd.factorize(s)
+    return codes, pd.Index(uniques)
+
+
 def flavor_list(df: pd.DataFrame) -> list[str]:
     """Sorted list of unique flavor titles in the dataset."""
     return sorted(df["title"].unique().tolist())
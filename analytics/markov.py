@@ -4,9 +4,45 @@ Built from consecutive-day pairs across all stores. The global matrix aggregates
 transitions from every store's sequence, giving a 42×42 (or N×N) probability matrix.
 """
 
+import weakref
+
 import numpy as np
 import pandas as pd
 
+from analytics.data_loader import category_codes
+
+# Optional numba kernel for the adjacent-row transition scan. Compiled
+# once on first use; False means numba isn't installed and callers take
+# the numpy bincount path instead.
+_NUMBA_KERNEL = None
+
+
+def _transition_kernel():
+    """Return the JIT-compiled scan kernel, or None without numba."""
+    global _NUMBA_KERNEL
+    if _NUMBA_KERNEL is None:
+        try:
+            import numba
+        except ImportError:
+            _NUMBA_KERNEL = False
+        else:
+            @numba.njit(cache=True)
+            def _count_transitions(store_codes, days, codes, n_flavors):
+                counts = np.zeros((n_flavors, n_flavors), dtype=np.int64)
+                for i in range(len(codes) - 1):
+                    if store_codes[i] == store_codes[i + 1] and days[i + 1] - days[i] == 1:
+                        counts[codes[i], codes[i + 1]] += 1
+                return counts
+
+            _NUMBA_KERNEL = _count_transitions
+    return _NUMBA_KERNEL or None
+
+
+# Normalized matrix memoized per frame (same pattern as basic_metrics):
+# top_transitions and self_transition_rate both start from it, and
+# repeated queries shouldn't rebuild the counts. Evicted on frame GC.
+_TM_MEMO: dict[int, pd.DataFrame] = {}
+
 
 def build_transition_counts(df: pd.DataFrame) -> tuple[pd.DataFrame, list[str]]:
     """Build raw transition count matrix from consecutive-day flavor pairs.
@@ -17,20 +53,34 @@ def build_transition_counts(df: pd.DataFrame) -> tuple[pd.DataFrame, list[str]]:
     Returns (count_matrix, flavor_labels) where count_matrix is N×N DataFrame.
     """
     flavors = sorted(df["title"].unique())
-    flavor_idx = {f: i for i, f in enumerate(flavors)}
     n = len(flavors)
-    counts = np.zeros((n, n), dtype=int)
-
-    for _, store_df in df.sort_values("flavor_date").groupby("store_slug"):
-        dates = store_df["flavor_date"].values
-        titles = store_df["title"].values
-        for i in range(len(dates) - 1):
-            # Only count consecutive calendar days
-            gap = (dates[i + 1] - dates[i]) / np.timedelta64(1, "D")
-            if gap == 1.0:
-                from_idx = flavor_idx[titles[i]]
-                to_idx = flavor_idx[titles[i + 1]]
-                counts[from_idx][to_idx] += 1
+
+    # One sort + one bincount instead of a Python loop over every pair.
+    # Adjacent rows within a store are candidate transitions; a boolean
+    # mask keeps only exact 1-day gaps, and the (from, to) code pairs
+    # are flattened to linear indices for a single bincount pass.
+    # Only the three columns involved are sorted (lexsort on their code
+    # arrays), so the rest of the frame never moves.
+    raw_codes, cats = category_codes(df, "title")
+    codes = pd.Index(flavors).get_indexer(cats)[raw_codes].astype(np.int64)
+    store_codes = category_codes(df, "store_slug")[0]
+    days = df["flavor_date"].to_numpy().astype("datetime64[D]").astype("int64")
+
+    order = np.lexsort((days, store_codes))
+    codes = codes[order]
+    store_codes = store_codes[order]
+    days = days[order]
+
+    kernel = _transition_kernel()
+    if kernel is not None:
+        counts = kernel(store_codes, days, codes, n)
+    else:
+        same_store = store_codes[1:] == store_codes[:-1]
+        next_day = np.diff(days) == 1
+        m = same_store & next_day
+
+        lin = codes[:-1][m] * n + codes[1:][m]
+        counts = np.bincount(lin, minlength=n * n).reshape(n, n)
 
     return pd.DataFrame(counts, index=flavors, columns=flavors), flavors
 
@@ -39,12 +89,21 @@ def transition_matrix(df: pd.DataFrame) -> pd.DataFrame:
     """Row-normalized transition probability matrix P(next | current).
 
     Each row sums to 1.0 (or 0.0 if a flavor has no observed transitions).
+    Memoized per frame, so repeated lookups pay the build cost once.
     """
-    counts, _ = build_transition_counts(df)
-    row_sums = counts.sum(axis=1)
-    # Avoid division by zero for flavors with no outgoing transitions
-    row_sums = row_sums.replace(0, 1)
-    return counts.div(row_sums, axis=0)
+    key = id(df)
+    memo = _TM_MEMO.get(key)
+    if memo is None:
+        counts, _ = build_transition_counts(df)
+        # In-place numpy divide; rows with no outgoing transitions stay
+        # all-zero (the where= mask skips them and counts are already 0).
+        arr = counts.values.astype(np.float32)
+        row_sums = arr.sum(axis=1)
+        np.divide(arr, row_sums[:, None], out=arr, where=row_sums[:, None] > 0)
+        memo = pd.DataFrame(arr, index=counts.index, columns=counts.columns)
+        _TM_MEMO[key] = memo
+        weakref.finalize(df, _TM_MEMO.pop, key, None)
+    return memo
 
 
 def top_transitions(df: pd.DataFrame, flavor: str, n: int = 5) -> list[dict]:
@@ -55,11 +114,12 @@ def top_transitions(df: pd.DataFrame, flavor: str, n: int = 5) -> list[dict]:
     tm = transition_matrix(df)
     if flavor not in tm.index:
         return []
-    row = tm.loc[flavor].sort_values(ascending=False)
+    top = tm.loc[flavor].sort_values(ascending=False).head(n)
+    top = top[top > 0]
+    probs = np.round(top.to_numpy(dtype=np.float64), 4)
     return [
-        {"flavor": f, "probability": round(float(p), 4)}
-        for f, p in row.head(n).items()
-        if p > 0
+        {"flavor": f, "probability": float(p)}
+        for f, p in zip(top.index, probs)
     ]
 
 
@@ -7,6 +7,8 @@ import numpy as np
 import pandas as pd
 from scipy import stats
 
+from analytics.data_loader import category_codes
+
 
 # ---------------------------------------------------------------------------
 # Day-of-week profiles
@@ -17,7 +19,14 @@ def dow_frequency_matrix(df: pd.DataFrame) -> pd.DataFrame:
 
     Returns DataFrame: rows=flavors, columns=0..6 (Mon..Sun), values=counts.
     """
-    ct = pd.crosstab(df["title"], df["dow"])
+    ct = (
+        df.assign(title=df["title"].astype("category"))
+        .groupby(["title", "dow"], observed=True, sort=True)
+        .size()
+        .unstack(fill_value=0)
+    )
+    ct.index = ct.index.astype(object)
+    ct = ct.rename_axis(index="title", columns="dow")
     # Ensure all 7 days present
     for d in range(7):
         if d not in ct.columns:
@@ -36,23 +45,28 @@ def dow_chi_squared(df: pd.DataFrame, min_count: int = 50) -> pd.DataFrame:
     dow_names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
     ct = dow_frequency_matrix(df)
 
-    records = []
-    for flavor in ct.index:
-        observed = ct.loc[flavor].values
-        if observed.sum() < min_count:
-            continue
-        chi2, p_value = stats.chisquare(observed)
-        peak_dow = int(np.argmax(observed))
-        records.append({
-            "title": flavor,
-            "chi2": round(float(chi2), 2),
-            "p_value": float(p_value),
-            "peak_dow": peak_dow,
-            "peak_name": dow_names[peak_dow],
+    # Closed-form chi-squared against the uniform null for all rows at
+    # once, with one survival-function call for the p-values — no
+    # per-flavor scipy dispatch.
+    m = ct.values
+    totals = m.sum(axis=1)
+    keep = totals >= min_count
+    m = m[keep]
+    totals = totals[keep]
+
+    result = pd.DataFrame()
+    if len(m) > 0:
+        expected = totals[:, None] / 7.0
+        chi2 = ((m - expected) ** 2 / expected).sum(axis=1)
+        p_values = stats.chi2.sf(chi2, df=6)
+        peak_dow = m.argmax(axis=1)
+        result = pd.DataFrame({
+            "title": np.asarray(ct.index[keep]),
+            "chi2": chi2.round(2),
+            "p_value": p_values,
+            "peak_dow": peak_dow.astype(int),
+            "peak_name": [dow_names[d] for d in peak_dow],
         })
-
-    result = pd.DataFrame(records)
-    if len(result) > 0:
         result = result.sort_values("p_value").reset_index(drop=True)
     return result
 
@@ -67,43 +81,35 @@ def recurrence_intervals(df: pd.DataFrame, store_slug: str | None = None) -> pd.
     Returns DataFrame: title, mean_gap, median_gap, std_gap, min_gap, max_gap, n_intervals.
     """
     subset = df[df["store_slug"] == store_slug] if store_slug else df
-    subset = subset.sort_values(["title", "store_slug", "flavor_date"])
-
-    records = []
-    for (flavor, store), group in subset.groupby(["title", "store_slug"]):
-        dates = group["flavor_date"].sort_values()
-        if len(dates) < 2:
-            continue
-        gaps = dates.diff().dropna().dt.days.values
-        records.append({
-            "title": flavor,
-            "store_slug": store,
-            "gaps": gaps,
-        })
-
-    if not records:
+    s = subset.sort_values(["title", "store_slug", "flavor_date"])
+
+    # One diff over the sorted frame; a same-(title, store) mask keeps
+    # only within-group gaps, then a single groupby aggregates per title.
+    days = s["flavor_date"].to_numpy().astype("datetime64[D]").astype("int64")
+    title_codes, title_cats = category_codes(s, "title")
+    store_codes = category_codes(s, "store_slug")[0]
+    same = (title_codes[1:] == title_codes[:-1]) & (store_codes[1:] == store_codes[:-1])
+
+    gaps = pd.DataFrame({
+        "title": np.asarray(title_cats)[title_codes[1:][same]],
+        "gap": np.diff(days)[same],
+    })
+    if len(gaps) == 0:
         return pd.DataFrame(columns=["title", "mean_gap", "median_gap", "std_gap",
                                       "min_gap", "max_gap", "n_intervals"])
 
-    # Aggregate gaps per flavor (across all stores unless scoped)
-    all_gaps: dict[str, list] = {}
-    for r in records:
-        all_gaps.setdefault(r["title"], []).extend(r["gaps"].tolist())
+    grp = gaps.groupby("title")["gap"]
+    summary = pd.DataFrame({
+        "title": np.asarray(grp.mean().index),
+        "mean_gap": grp.mean().round(1).to_numpy(),
+        "median_gap": grp.median().astype(float).to_numpy(),
+        "std_gap": grp.std(ddof=0).round(1).to_numpy(),
+        "min_gap": grp.min().astype(int).to_numpy(),
+        "max_gap": grp.max().astype(int).to_numpy(),
+        "n_intervals": grp.size().to_numpy(),
+    })
 
-    summary = []
-    for flavor, gaps in all_gaps.items():
-        g = np.array(gaps)
-        summary.append({
-            "title": flavor,
-            "mean_gap": round(float(g.mean()), 1),
-            "median_gap": float(np.median(g)),
-            "std_gap": round(float(g.std()), 1),
-            "min_gap": int(g.min()),
-            "max_gap": int(g.max()),
-            "n_intervals": len(g),
-        })
-
-    return pd.DataFrame(summary).sort_values("mean_gap").reset_index(drop=True)
+    return summary.sort_values("mean_gap").reset_index(drop=True)
 
 
 # ---------------------------------------------------------------------------
@@ -115,7 +121,14 @@ def seasonal_heatmap(df: pd.DataFrame) -> pd.DataFrame:
 
     Returns DataFrame: rows=flavors, columns=1..12 (Jan..Dec), values=counts.
     """
-    ct = pd.crosstab(df["title"], df["month"])
+    ct = (
+        df.assign(title=df["title"].astype("category"))
+        .groupby(["title", "month"], observed=True, sort=True)
+        .size()
+        .unstack(fill_value=0)
+    )
+    ct.index = ct.index.astype(object)
+    ct = ct.rename_axis(index="title", columns="month")
     for m in range(1, 13):
         if m not in ct.columns:
             ct[m] = 0
@@ -134,30 +147,34 @@ def seasonal_flavors(df: pd.DataFrame, concentration_threshold: float = 0.5) ->
     month_names = {1: "Jan", 2: "Feb", 3: "Mar", 4: "Apr", 5: "May", 6: "Jun",
                    7: "Jul", 8: "Aug", 9: "Sep", 10: "Oct", 11: "Nov", 12: "Dec"}
 
+    # All 12 wrapped 3-month window sums for every flavor at once: pad
+    # two wrap-around columns, then add the three shifted views.
+    m = heatmap.values
+    totals = m.sum(axis=1)
+    keep = totals >= 20
+    m = m[keep]
+    totals = totals[keep]
+    flavors = heatmap.index[keep]
+
+    wrapped = np.concatenate([m, m[:, :2]], axis=1)
+    windows = wrapped[:, :12] + wrapped[:, 1:13] + wrapped[:, 2:14]
+    best_start = windows.argmax(axis=1)
+    best_sum = windows[np.arange(len(m)), best_start]
+    concentration = best_sum / totals  # totals >= 20 here, never zero
+
+    seasonal = concentration >= concentration_threshold
+    conc_rounded = np.round(concentration[seasonal].astype(np.float64), 3)
+
     records = []
-    for flavor in heatmap.index:
-        counts = heatmap.loc[flavor].values
-        total = counts.sum()
-        if total < 20:
-            continue
-
-        # Sliding 3-month window (wrapping around Dec→Jan)
-        best_start = 0
-        best_sum = 0
-        for start in range(12):
-            window_sum = sum(counts[(start + i) % 12] for i in range(3))
-            if window_sum > best_sum:
-                best_sum = window_sum
-                best_start = start
-
-        concentration = best_sum / total
-        if concentration >= concentration_threshold:
-            peak_months = [month_names[(best_start + i) % 12 + 1] for i in range(3)]
-            records.append({
-                "title": flavor,
-                "peak_months": ", ".join(peak_months),
-                "concentration": round(concentration, 3),
-                "total_count": int(total),
-            })
+    for flavor, start, conc, total in zip(
+        flavors[seasonal], best_start[seasonal], conc_rounded, totals[seasonal]
+    ):
+        peak_months = [month_names[(start + i) % 12 + 1] for i in range(3)]
+        records.append({
+            "title": flavor,
+            "peak_months": ", ".join(peak_months),
+            "concentration": float(conc),
+            "total_count": int(total),
+        })
 
     return pd.DataFrame(records).sort_values("concentration", ascending=False).reset_index(drop=True)
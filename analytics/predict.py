@@ -30,6 +30,19 @@ class FlavorPredictor:
         """
         raise NotImplementedError
 
+    def predict_proba_batch(self, stores, dates) -> np.ndarray:
+        """Probability matrix for aligned (store, date) pairs.
+
+        Returns an (n_samples, n_flavors) array with columns in
+        `all_flavors` order. The default implementation loops
+        predict_proba; subclasses can override with a true batched path.
+        """
+        if len(stores) == 0:
+            return np.empty((0, len(getattr(self, "all_flavors", []))))
+        return np.vstack([
+            self.predict_proba(s, d).to_numpy() for s, d in zip(stores, dates)
+        ])
+
 
 # ---------------------------------------------------------------------------
 # Model 1: Frequency + Recency baseline
@@ -80,7 +93,7 @@ class FrequencyRecencyModel(FlavorPredictor):
 
         dow_counts = (
             df_store[df_store["title"].isin(eligible)]
-            .groupby("title")["dow"]
+            .groupby("title", observed=True)["dow"]
             .apply(lambda s: (s == target_dow).sum())
         )
 
@@ -116,7 +129,7 @@ class FrequencyRecencyModel(FlavorPredictor):
 
         seasonal_counts = (
             df_store[df_store["title"].isin(eligible)]
-            .groupby("title")["month"]
+            .groupby("title", observed=True)["month"]
             .apply(lambda s: s.isin(months_in_window).sum())
         )
 
@@ -150,9 +163,11 @@ class FrequencyRecencyModel(FlavorPredictor):
         if total_span <= 0:
             total_span = 1
 
-        last_seen = historical.groupby("title")["flavor_date"].max()
+        last_seen = historical.groupby("title", observed=True)["flavor_date"].max()
         days_since = (date - last_seen).dt.days
+        # Drop zero-count categories so division below aligns with days_since
         counts = historical["title"].value_counts()
+        counts = counts[counts > 0]
 
         # Expected interval per flavor: span / (count - 1), clipped
         expected = total_span / counts.clip(lower=2).sub(1)
@@ -227,9 +242,10 @@ class MarkovRecencyModel(FlavorPredictor):
         if len(historical) > 0:
             store_dates = historical["flavor_date"]
             total_span = max((store_dates.max() - store_dates.min()).days, 1)
-            last_seen = historical.groupby("title")["flavor_date"].max()
+            last_seen = historical.groupby("title", observed=True)["flavor_date"].max()
             days_since = (date - last_seen).dt.days
             counts = historical["title"].value_counts()
+            counts = counts[counts > 0]
             expected = (total_span / counts.clip(lower=2).sub(1)).clip(lower=7)
             recency_scores = (days_since / expected).clip(upper=3.0) / 3.0
             recency_scores = recency_scores.reindex(self.all_flavors, fill_value=0.0)
@@ -273,7 +289,7 @@ class XGBoostFlavorModel(FlavorPredictor):
 
         # Days since last for each flavor
         if len(historical) > 0:
-            last_seen = historical.groupby("title")["flavor_date"].max()
+            last_seen = historical.groupby("title", observed=True)["flavor_date"].max()
             for flavor in self.all_flavors:
                 if flavor in last_seen.index:
                     days = (date - last_seen[flavor]).days
@@ -305,7 +321,7 @@ class XGBoostFlavorModel(FlavorPredictor):
         X_rows = []
         y_labels = []
 
-        for store_slug, store_df in df.groupby("store_slug"):
+        for store_slug, store_df in df.groupby("store_slug", observed=True):
             store_df = store_df.sort_values("flavor_date")
             dates = store_df["flavor_date"].values
             titles = store_df["title"].values
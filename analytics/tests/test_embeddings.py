@@ -14,16 +14,17 @@ pytestmark = pytest.mark.skipif(
 )
 
 
-class TestEmbeddingLogic:
-    @pytest.fixture(scope="class")
-    def tfidf_embeddings(self):
-        from sklearn.feature_extraction.text import TfidfVectorizer
-        import numpy as np
-        texts = [f"{f['title']}: {f['description']}" for f in SEED_CATALOG]
-        titles = [f["title"] for f in SEED_CATALOG]
-        embeddings = TfidfVectorizer().fit_transform(texts).toarray().astype(np.float32)
-        return titles, embeddings
+@pytest.fixture(scope="module")
+def tfidf_embeddings():
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    import numpy as np
+    texts = [f"{f['title']}: {f['description']}" for f in SEED_CATALOG]
+    titles = [f["title"] for f in SEED_CATALOG]
+    embeddings = TfidfVectorizer().fit_transform(texts).toarray().astype(np.float32)
+    return titles, embeddings
 
+
+class TestEmbeddingLogic:
     def test_nearest_neighbors_turtle(self, tfidf_embeddings):
         titles, emb = tfidf_embeddings
         names = [n["title"] for n in nearest_neighbors(emb, titles, "Turtle", n=5)]
@@ -31,6 +31,11 @@ def matrix(df):
     return store_flavor_matrix(df, normalize_rows=True)
 
 
+@pytest.fixture(scope="module")
+def comparison(matrix):
+    return compare_pca_vs_nmf(matrix, n_components=4, n_clusters=3)
+
+
 class TestPCADecompose:
     def test_shapes(self, matrix):
         n_components = 6
@@ -123,21 +128,18 @@ class TestGroupAlignment:
 
 
 class TestCompareVsNMF:
-    def test_comparison_keys(self, matrix):
-        result = compare_pca_vs_nmf(matrix, n_components=4, n_clusters=3)
+    def test_comparison_keys(self, comparison):
         expected_keys = {
             "pca_silhouette", "nmf_silhouette", "silhouette_delta",
             "pca_alignment", "nmf_alignment", "alignment_delta",
             "pca_cumulative_variance_at_3", "pca_components",
             "n_stores", "n_flavors", "recommendation",
         }
-        assert set(result.keys()) == expected_keys
+        assert set(comparison.keys()) == expected_keys
 
-    def test_recommendation_is_valid(self, matrix):
-        result = compare_pca_vs_nmf(matrix, n_components=4, n_clusters=3)
-        assert result["recommendation"] in ("pca", "nmf")
+    def test_recommendation_is_valid(self, comparison):
+        assert comparison["recommendation"] in ("pca", "nmf")
 
-    def test_dimensions_match(self, matrix):
-        result = compare_pca_vs_nmf(matrix, n_components=4, n_clusters=3)
-        assert result["n_stores"] == matrix.shape[0]
-        assert result["n_flavors"] == matrix.shape[1]
+    def test_dimensions_match(self, matrix, comparison):
+        assert comparison["n_stores"] == matrix.shape[0]
+        assert comparison["n_flavors"] == matrix.shape[1]
@@ -7,8 +7,10 @@ Custard Calendar Worker API for today's flavor, and speaks the result.
 
 import logging
 import re
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
-import requests
 from ask_sdk_core.dispatch_components import (
     AbstractExceptionHandler,
     AbstractRequestHandler,
@@ -22,11 +24,61 @@ from ask_sdk_model.slu.entityresolution import StatusCode
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Single background thread for expensive log formatting (tracebacks),
+# keeping it off the billed request path. Lambda lets the thread finish
+# during the post-response window before the container freezes.
+_LOG_EXECUTOR = ThreadPoolExecutor(max_workers=1)
+
 # Worker API base URL -- no trailing slash
 API_BASE = "https://custard-calendar.chris-kaschner.workers.dev/api/v1"
 
-# Timeout for upstream API calls (seconds)
-API_TIMEOUT = 5
+# Timeouts for upstream API calls: fail a stuck TCP connect fast and
+# bound the read separately so the skill answers within its own budget.
+API_CONNECT_TIMEOUT = 1.0
+API_READ_TIMEOUT = 3.0
+
+# Module-level client so warm Lambda invocations reuse the TCP+TLS
+# connection to the Worker instead of handshaking on every call. HTTP/2
+# lets concurrent warm invocations multiplex over one connection.
+# Created lazily: `httpx` only loads on the GetFlavor path, keeping
+# Launch/Help/Stop cold starts lighter. httpx does not retry by itself,
+# so a duplicate /today call can't be silently re-issued mid-timeout.
+_CLIENT = None
+
+
+def _get_client():
+    """Return the shared `httpx.Client`, creating it on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        import httpx
+
+        _CLIENT = httpx.Client(
+            base_url=API_BASE,
+            http2=True,
+            timeout=httpx.Timeout(
+                5.0, connect=API_CONNECT_TIMEOUT, read=API_READ_TIMEOUT
+            ),
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=60),
+        )
+    return _CLIENT
+
+# Per-container cache of /today responses. Popular stores get asked
+# repeatedly within a warm container, so short-circuit the HTTP call
+# for a few minutes. Bounded LRU so container memory stays flat.
+_TODAY_CACHE: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+_TODAY_TTL = 300  # seconds
+_TODAY_CACHE_MAX = 128
+
+# Hoisted enum lookup for the entity-resolution match check.
+_ER_OK = StatusCode.ER_SUCCESS_MATCH
+
+# Reused on every successful GetFlavor response.
+_REPROMPT_AGAIN = "Want to check another store?"
+
+# Slugify patterns, compiled once at container init.
+_RE_NONSLUG = re.compile(r"[^a-z0-9\s-]")
+_RE_WS = re.compile(r"\s+")
+_RE_DASHES = re.compile(r"-+")
 
 
 def _resolve_slot_to_slug(handler_input: HandlerInput) -> str | None:
@@ -36,12 +88,11 @@ def _resolve_slot_to_slug(handler_input: HandlerInput) -> str | None:
     store names to their canonical slug IDs). Falls back to naive
     slugification of the raw spoken value.
     """
-    slot = (
-        handler_input.request_envelope.request.intent.slots.get("store")
-        if hasattr(handler_input.request_envelope.request, "intent")
-        and handler_input.request_envelope.request.intent.slots
-        else None
-    )
+    try:
+        slots = handler_input.request_envelope.request.intent.slots
+    except AttributeError:
+        return None
+    slot = slots.get("store") if slots else None
     if slot is None:
         return None
 
@@ -52,7 +103,7 @@ def _resolve_slot_to_slug(handler_input: HandlerInput) -> str | None:
         for authority in resolutions.resolutions_per_authority:
             if (
                 authority.status
-                and authority.status.code == StatusCode.ER_SUCCESS_MATCH
+                and authority.status.code == _ER_OK
                 and authority.values
             ):
                 return authority.values[0].value.id
@@ -72,9 +123,9 @@ def _slugify(text: str) -> str:
     This is a best-effort fallback when entity resolution misses.
     """
     text = text.lower().strip()
-    text = re.sub(r"[^a-z0-9\s-]", "", text)
-    text = re.sub(r"\s+", "-", text)
-    text = re.sub(r"-+", "-", text)
+    text = _RE_NONSLUG.sub("", text)
+    text = _RE_WS.sub("-", text)
+    text = _RE_DASHES.sub("-", text)
     return text.strip("-")
 
 
@@ -82,11 +133,26 @@ def _fetch_today(slug: str) -> dict:
     """Call the Worker API for today's flavor at the given slug.
 
     Returns the parsed JSON response dict. Raises on HTTP or network errors.
+    Successful responses are cached per slug for `_TODAY_TTL` seconds so
+    repeat asks within a warm container skip the network entirely.
     """
-    url = f"{API_BASE}/today"
-    resp = requests.get(url, params={"slug": slug}, timeout=API_TIMEOUT)
+    now = time.monotonic()
+    cached = _TODAY_CACHE.get(slug)
+    if cached is not None:
+        ts, data = cached
+        if now - ts < _TODAY_TTL:
+            _TODAY_CACHE.move_to_end(slug)
+            return data
+        del _TODAY_CACHE[slug]
+
+    resp = _get_client().get("/today", params={"slug": slug})
     resp.raise_for_status()
-    return resp.json()
+    data = resp.json()
+
+    _TODAY_CACHE[slug] = (now, data)
+    if len(_TODAY_CACHE) > _TODAY_CACHE_MAX:
+        _TODAY_CACHE.popitem(last=False)
+    return data
 
 
 # ---------------------------------------------------------------------------
@@ -135,10 +201,12 @@ class GetFlavorIntentHandler(AbstractRequestHandler):
                 .response
             )
 
+        import httpx
+
         try:
             data = _fetch_today(slug)
-        except requests.exceptions.HTTPError as exc:
-            status = exc.response.status_code if exc.response is not None else 0
+        except httpx.HTTPStatusError as exc:
+            status = exc.response.status_code
             if status == 400:
                 # Slug not recognized by the API
                 speech = (
@@ -157,7 +225,7 @@ class GetFlavorIntentHandler(AbstractRequestHandler):
                 .speak(speech)
                 .response
             )
-        except requests.exceptions.RequestException as exc:
+        except httpx.HTTPError as exc:
             logger.error("API request failed for slug=%s: %s", slug, exc)
             speech = (
                 "I had trouble reaching the flavor forecast service. "
@@ -185,11 +253,11 @@ class GetFlavorIntentHandler(AbstractRequestHandler):
             )
 
         # Speak the flavor and offer a follow-up
-        reprompt = "Want to check another store?"
+        speech = f"{spoken} {_REPROMPT_AGAIN}" if spoken else _REPROMPT_AGAIN
         return (
             handler_input.response_builder
-            .speak(f"{spoken} Want to check another store?")
-            .ask(reprompt)
+            .speak(speech)
+            .ask(_REPROMPT_AGAIN)
             .response
         )
 
@@ -273,7 +341,14 @@ class CatchAllExceptionHandler(AbstractExceptionHandler):
         return True
 
     def handle(self, handler_input: HandlerInput, exception: Exception) -> Response:
-        logger.error("Unhandled exception: %s", exception, exc_info=True)
+        # Cheap one-liner now; full traceback formatted off-path.
+        logger.error(
+            "Unhandled exception: type=%s msg=%s", type(exception).__name__, exception
+        )
+        exc_info = (type(exception), exception, exception.__traceback__)
+        _LOG_EXECUTOR.submit(
+            logger.error, "Unhandled exception traceback:", exc_info=exc_info
+        )
         speech = (
             "Sorry, something went wrong with the flavor forecast. "
             "Please try again."
@@ -14,8 +14,14 @@ Usage:
 import argparse
 import json
 import sys
+from collections import defaultdict
 from pathlib import Path
 
+try:  # Optional fast serializer for the large interaction model
+    import orjson
+except ImportError:
+    orjson = None
+
 # Default paths relative to the repo root
 REPO_ROOT = Path(__file__).resolve().parent.parent.parent
 DEFAULT_MANIFEST = REPO_ROOT / "docs" / "stores.json"
@@ -41,18 +47,21 @@ def build_slot_values(stores: list[dict]) -> list[dict]:
     first is used as the primary value -- the rest become synonyms. This
     avoids Alexa rejecting duplicate slot values during model building.
     """
-    # Group stores by (city, state) to handle cities with multiple locations
-    city_groups: dict[tuple[str, str], list[dict]] = {}
+    # Group stores by (city, state) to handle cities with multiple
+    # locations. defaultdict avoids the per-row setdefault temporary;
+    # insertion order keeps output deterministic for a given manifest.
+    city_groups: dict[tuple[str, str], list[dict]] = defaultdict(list)
     for store in stores:
-        key = (store["city"], store["state"])
-        city_groups.setdefault(key, []).append(store)
+        city_groups[(store["city"], store["state"])].append(store)
 
     values = []
     for (city, state), group in city_groups.items():
         canonical_value = f"{city}, {state}"
+        canonical_lower = canonical_value.lower()
 
-        # Collect synonyms from all stores in this city
-        synonyms = set()
+        # Collect synonyms from all stores in this city; dedup once at
+        # the end instead of per-insert set churn
+        synonyms = []
         slugs = []
         for store in group:
             slug = store["slug"]
@@ -61,12 +70,12 @@ def build_slot_values(stores: list[dict]) -> list[dict]:
 
             # Add the store name if it differs from the canonical value
             if name and name != canonical_value:
-                synonyms.add(name)
+                synonyms.append(name)
 
             # Add slug with hyphens replaced by spaces
             slug_spoken = slug.replace("-", " ")
-            if slug_spoken != canonical_value.lower():
-                synonyms.add(slug_spoken)
+            if slug_spoken != canonical_lower:
+                synonyms.append(slug_spoken)
 
         # Use the first store's slug as the primary ID.
         # For single-location cities this is the only slug.
@@ -77,10 +86,10 @@ def build_slot_values(stores: list[dict]) -> list[dict]:
 
         # Add the bare city name as a synonym for natural speech
         if city != canonical_value:
-            synonyms.add(city)
+            synonyms.append(city)
 
-        # Sort for deterministic output
-        sorted_synonyms = sorted(synonyms)
+        # Dedup + sort once for deterministic output
+        sorted_synonyms = sorted(set(synonyms))
 
         slot_value = {
             "id": primary_slug,
@@ -179,10 +188,13 @@ def main() -> None:
     # Update the STORE_NAME type
     updated = update_interaction_model(model, slot_values)
 
-    # Write back
-    with open(args.model, "w") as f:
-        json.dump(updated, f, indent=2, ensure_ascii=False)
-        f.write("\n")
+    # Write back (orjson never ASCII-escapes, matching ensure_ascii=False)
+    if orjson is not None:
+        args.model.write_bytes(orjson.dumps(updated, option=orjson.OPT_INDENT_2) + b"\n")
+    else:
+        with open(args.model, "w") as f:
+            json.dump(updated, f, indent=2, ensure_ascii=False)
+            f.write("\n")
 
     print(f"Updated {args.model}")
 
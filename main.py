@@ -14,6 +14,12 @@ import argparse
 import subprocess
 import yaml
 import logging
+
+try:
+    # libyaml tokenizes in C — worth it for frequent cron invocations.
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 from datetime import datetime, timezone
 from typing import Dict
 from pathlib import Path
@@ -66,7 +72,7 @@ def load_config(config_path: str = 'config.yaml') -> Dict:
     """Load configuration from YAML file."""
     try:
         with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=_YamlLoader)
         logger.info(f"Loaded configuration from {config_path}")
         return config
     except FileNotFoundError:
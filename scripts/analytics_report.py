@@ -20,14 +20,16 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import contextlib
-import io
+import functools
+import gzip
 import json
 import os
+import re
 import sys
 import urllib.request
 import urllib.error
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -36,18 +38,44 @@ WORKLOG_PATH = Path(__file__).resolve().parent.parent / "WORKLOG.md"
 REPORT_FROM_EMAIL = os.environ.get("ALERT_FROM_EMAIL", "alerts@custard-calendar.com")
 REPORT_USER_AGENT = os.environ.get("ANALYTICS_REPORT_USER_AGENT", "custard-analytics-report/1.0")
 
+try:
+    # All report queries hit the same Worker host; a shared pool keeps
+    # the TLS connection alive so only the first request pays the
+    # handshake. PoolManager is thread-safe, so the concurrent fetches
+    # in main() share it too. urllib3 ships with requests, but fall
+    # back to plain urlopen if it is ever absent.
+    import urllib3
+    _POOL = urllib3.PoolManager(num_pools=1, maxsize=4)
+except ImportError:  # pragma: no cover
+    urllib3 = None
+    _POOL = None
+
 
 def fetch_json(url: str, token: str) -> dict:
-    req = urllib.request.Request(
-        url,
-        headers={
-            "Authorization": f"Bearer {token}",
-            "User-Agent": REPORT_USER_AGENT,
-        },
-    )
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "User-Agent": REPORT_USER_AGENT,
+        # Summary JSON compresses ~5-10x; urllib3 inflates transparently
+        # and the urlopen fallback decompresses by hand below.
+        "Accept-Encoding": "gzip",
+    }
+    if _POOL is not None:
+        try:
+            resp = _POOL.request("GET", url, headers=headers, timeout=15, retries=False)
+        except urllib3.exceptions.HTTPError as exc:
+            raise RuntimeError(f"Network error fetching {url}: {exc}") from exc
+        if resp.status >= 400:
+            body = resp.data.decode("utf-8", errors="replace")
+            raise RuntimeError(f"HTTP {resp.status} from {url}: {body}")
+        return json.loads(resp.data)
+
+    req = urllib.request.Request(url, headers=headers)
     try:
         with urllib.request.urlopen(req, timeout=15) as resp:
-            return json.loads(resp.read())
+            raw = resp.read()
+            if resp.headers.get("Content-Encoding") == "gzip":
+                raw = gzip.decompress(raw)
+            return json.loads(raw)
     except urllib.error.HTTPError as exc:
         body = exc.read().decode("utf-8", errors="replace")
         raise RuntimeError(f"HTTP {exc.code} from {url}: {body}") from exc
@@ -66,11 +94,21 @@ def fmt_row(label: str, value: str | int, width: int = 32) -> str:
     return f"  {label_s}{value}"
 
 
-def print_section(title: str) -> None:
-    print()
-    print(f"-- {title} " + "-" * max(0, 60 - len(title) - 4))
+def add_section(out: list[str], title: str) -> None:
+    out.append("")
+    out.append(f"-- {title} " + "-" * max(0, 60 - len(title) - 4))
 
 
+# Referrer strings repeat heavily (same domains day after day, and the
+# weekly path re-buckets the same top_referrers list), so both helpers
+# are memoized; a single compiled alternation per bucket replaces the
+# per-domain substring scans.
+_SEARCH_RE = re.compile(r"google\.|bing\.|duckduckgo\.|yahoo\.")
+_SOCIAL_RE = re.compile(r"facebook\.|instagram\.|x\.com|twitter\.|reddit\.|t\.co")
+_WIDGET_RE = re.compile(r"scriptable|widget")
+
+
+@functools.lru_cache(maxsize=1024)
 def domain_from_referrer(referrer: str | None) -> str:
     if not referrer:
         return "(direct)"
@@ -86,25 +124,39 @@ def domain_from_referrer(referrer: str | None) -> str:
     return text.lower()
 
 
+@functools.lru_cache(maxsize=1024)
 def referrer_bucket(referrer: str | None) -> str:
     domain = domain_from_referrer(referrer)
     if domain == "(direct)":
         return "direct"
-    if any(engine in domain for engine in ("google.", "bing.", "duckduckgo.", "yahoo.")):
+    if _SEARCH_RE.search(domain):
         return "search"
-    if any(social in domain for social in ("facebook.", "instagram.", "x.com", "twitter.", "reddit.", "t.co")):
+    if _SOCIAL_RE.search(domain):
         return "social"
-    if "scriptable" in domain or "widget" in domain:
+    if _WIDGET_RE.search(domain):
         return "widget"
     return domain
 
 
+def _by_type_index(events_data: dict) -> dict[str, int]:
+    """Index by_type rows as event_type -> count, built once per response.
+
+    report_weekly probes several event types against the same list;
+    stashing the index on the response dict turns each probe into a
+    hash lookup instead of a fresh linear scan.
+    """
+    index = events_data.get("_by_type_index")
+    if index is None:
+        index = {
+            (row.get("event_type") or ""): int(row.get("count", 0) or 0)
+            for row in (events_data.get("by_type") or [])
+        }
+        events_data["_by_type_index"] = index
+    return index
+
+
 def count_event_type(events_data: dict, event_type: str) -> int:
-    by_type = events_data.get("by_type", []) or []
-    for row in by_type:
-        if (row.get("event_type") or "") == event_type:
-            return int(row.get("count", 0) or 0)
-    return 0
+    return _by_type_index(events_data).get(event_type, 0)
 
 
 def bucket_referrers(top_referrers: list[dict]) -> list[tuple[str, int]]:
@@ -116,59 +168,75 @@ def bucket_referrers(top_referrers: list[dict]) -> list[tuple[str, int]]:
     return sorted(buckets.items(), key=lambda kv: kv[1], reverse=True)
 
 
-def report_events(data: dict) -> None:
+def _flush(lines: list[str]) -> None:
+    """Emit collected report lines to stdout in one write."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def report_events(data: dict, out: list[str] | None = None) -> None:
+    """Report interaction events; appends lines to ``out`` if given, else prints.
+
+    Lines accumulate in a plain list instead of going through per-line
+    print calls (or a redirect_stdout hack when building the email body)
+    — one join, one write.
+    """
+    lines: list[str] = [] if out is None else out
     t = data.get("totals", {})
     days = data.get("window_days", "?")
     total = t.get("events", 0)
 
-    print_section(f"Interaction Events (last {days}d)")
-    print(fmt_row("Total events", total))
-    print(fmt_row("CTA clicks", f"{t.get('cta_clicks', 0):,}  ({pct(t.get('cta_clicks', 0), total)})"))
-    print(fmt_row("Popup opens", f"{t.get('popup_opens', 0):,}  ({pct(t.get('popup_opens', 0), total)})"))
-    print(fmt_row("Signal views", f"{t.get('signal_views', 0):,}  ({pct(t.get('signal_views', 0), total)})"))
-    print(fmt_row("Quiz completions", f"{t.get('quiz_completions', 0):,}  ({pct(t.get('quiz_completions', 0), total)})"))
-    print(fmt_row("Onboarding views", f"{t.get('onboarding_views', 0):,}"))
-    print(fmt_row("Onboarding clicks", f"{t.get('onboarding_clicks', 0):,}"))
+    add_section(lines, f"Interaction Events (last {days}d)")
+    lines.append(fmt_row("Total events", total))
+    lines.append(fmt_row("CTA clicks", f"{t.get('cta_clicks', 0):,}  ({pct(t.get('cta_clicks', 0), total)})"))
+    lines.append(fmt_row("Popup opens", f"{t.get('popup_opens', 0):,}  ({pct(t.get('popup_opens', 0), total)})"))
+    lines.append(fmt_row("Signal views", f"{t.get('signal_views', 0):,}  ({pct(t.get('signal_views', 0), total)})"))
+    lines.append(fmt_row("Quiz completions", f"{t.get('quiz_completions', 0):,}  ({pct(t.get('quiz_completions', 0), total)})"))
+    lines.append(fmt_row("Onboarding views", f"{t.get('onboarding_views', 0):,}"))
+    lines.append(fmt_row("Onboarding clicks", f"{t.get('onboarding_clicks', 0):,}"))
 
     by_action = data.get("by_action", [])
     if by_action:
-        print_section("Top Actions")
+        add_section(lines, "Top Actions")
         for row in by_action[:10]:
-            print(fmt_row(row.get("action") or "(none)", row.get("count", 0)))
+            lines.append(fmt_row(row.get("action") or "(none)", row.get("count", 0)))
 
     by_page = data.get("by_page", [])
     if by_page:
-        print_section("Events by Page")
+        add_section(lines, "Events by Page")
         for row in by_page[:10]:
-            print(fmt_row(row.get("page") or "(none)", row.get("count", 0)))
+            lines.append(fmt_row(row.get("page") or "(none)", row.get("count", 0)))
 
     top_stores = data.get("top_stores", [])
     if top_stores:
-        print_section("Top Stores by Interaction")
+        add_section(lines, "Top Stores by Interaction")
         for row in top_stores[:10]:
-            print(fmt_row(row.get("store_slug") or "(none)", row.get("count", 0)))
+            lines.append(fmt_row(row.get("store_slug") or "(none)", row.get("count", 0)))
 
     top_flavors = data.get("top_flavors", [])
     if top_flavors:
-        print_section("Top Flavors by Interaction")
+        add_section(lines, "Top Flavors by Interaction")
         for row in top_flavors[:10]:
-            print(fmt_row(row.get("flavor") or "(none)", row.get("count", 0)))
+            lines.append(fmt_row(row.get("flavor") or "(none)", row.get("count", 0)))
 
     by_device_type = data.get("by_device_type", [])
     if by_device_type:
-        print_section("By Device Type")
+        add_section(lines, "By Device Type")
         for row in by_device_type[:10]:
-            print(fmt_row(row.get("device_type") or "unknown", row.get("count", 0)))
+            lines.append(fmt_row(row.get("device_type") or "unknown", row.get("count", 0)))
 
     top_referrers = data.get("top_referrers", [])
     if top_referrers:
-        print_section("Top Referrers")
+        add_section(lines, "Top Referrers")
         for row in top_referrers[:10]:
             domain = domain_from_referrer(row.get("referrer"))
-            print(fmt_row(domain, row.get("count", 0)))
+            lines.append(fmt_row(domain, row.get("count", 0)))
+
+    if out is None:
+        _flush(lines)
 
 
-def report_quiz(data: dict) -> None:
+def report_quiz(data: dict, out: list[str] | None = None) -> None:
+    lines: list[str] = [] if out is None else out
     days = data.get("window_days", "?")
     totals = data.get("totals", {})
     completions = totals.get("completions", 0)
@@ -178,68 +246,78 @@ def report_quiz(data: dict) -> None:
     trivia_correct = totals.get("trivia_correct", 0)
     trivia_total = totals.get("trivia_total", 0)
 
-    print_section(f"Quiz Results (last {days}d)")
-    print(fmt_row("Total completions", completions))
-    print(fmt_row("Matched in radius", f"{matched:,}  ({pct(matched, completions)})"))
-    print(fmt_row("Matched outside radius", f"{outside:,}  ({pct(outside, completions)})"))
-    print(fmt_row("No match", f"{no_match:,}  ({pct(no_match, completions)})"))
+    add_section(lines, f"Quiz Results (last {days}d)")
+    lines.append(fmt_row("Total completions", completions))
+    lines.append(fmt_row("Matched in radius", f"{matched:,}  ({pct(matched, completions)})"))
+    lines.append(fmt_row("Matched outside radius", f"{outside:,}  ({pct(outside, completions)})"))
+    lines.append(fmt_row("No match", f"{no_match:,}  ({pct(no_match, completions)})"))
     if trivia_total:
-        print(fmt_row("Trivia accuracy", f"{trivia_correct}/{trivia_total}  ({pct(trivia_correct, trivia_total)})"))
+        lines.append(fmt_row("Trivia accuracy", f"{trivia_correct}/{trivia_total}  ({pct(trivia_correct, trivia_total)})"))
 
     top_archetypes = data.get("top_archetypes", [])
     if top_archetypes:
-        print_section("Top Quiz Archetypes")
+        add_section(lines, "Top Quiz Archetypes")
         for row in top_archetypes[:10]:
-            print(fmt_row(row.get("archetype") or "(none)", row.get("count", 0)))
+            lines.append(fmt_row(row.get("archetype") or "(none)", row.get("count", 0)))
 
     top_quizzes = data.get("top_quizzes", [])
     if top_quizzes:
-        print_section("Quiz Modes Played")
+        add_section(lines, "Quiz Modes Played")
         for row in top_quizzes[:10]:
-            print(fmt_row(row.get("quiz_id") or "(none)", row.get("count", 0)))
+            lines.append(fmt_row(row.get("quiz_id") or "(none)", row.get("count", 0)))
 
+    if out is None:
+        _flush(lines)
 
-def report_weekly(events_data: dict, widget_data: dict, scoop_filter_data: dict, days: int) -> None:
-    print_section(f"Weekly Signal Digest (last {days}d)")
+
+def report_weekly(
+    events_data: dict,
+    widget_data: dict,
+    scoop_filter_data: dict,
+    days: int,
+    out: list[str] | None = None,
+) -> None:
+    lines: list[str] = [] if out is None else out
+    add_section(lines, f"Weekly Signal Digest (last {days}d)")
 
     alert_success = count_event_type(events_data, "alert_subscribe_success")
-    print(fmt_row("Alerts subscribed", f"{'YES' if alert_success > 0 else 'NO'} ({alert_success:,})"))
+    lines.append(fmt_row("Alerts subscribed", f"{'YES' if alert_success > 0 else 'NO'} ({alert_success:,})"))
 
     widget_taps = int((widget_data.get("totals") or {}).get("events", 0) or 0)
-    print(fmt_row("Widget taps", f"{'YES' if widget_taps > 0 else 'NO'} ({widget_taps:,})"))
+    lines.append(fmt_row("Widget taps", f"{'YES' if widget_taps > 0 else 'NO'} ({widget_taps:,})"))
 
     scoop_filters = int((scoop_filter_data.get("totals") or {}).get("events", 0) or 0)
-    print(fmt_row("Scoop filters", f"{'YES' if scoop_filters > 0 else 'NO'} ({scoop_filters:,})"))
+    lines.append(fmt_row("Scoop filters", f"{'YES' if scoop_filters > 0 else 'NO'} ({scoop_filters:,})"))
 
     buckets = bucket_referrers(events_data.get("top_referrers", []))
     top_bucket = buckets[0][0] if buckets else "none"
-    print(fmt_row("Top referrer bucket", top_bucket))
+    lines.append(fmt_row("Top referrer bucket", top_bucket))
 
     top_widget_stores = widget_data.get("top_stores", []) or []
+    add_section(lines, "Widget Taps by Store Slug")
     if top_widget_stores:
-        print_section("Widget Taps by Store Slug")
         for row in top_widget_stores[:10]:
-            print(fmt_row(row.get("store_slug") or "(none)", row.get("count", 0)))
+            lines.append(fmt_row(row.get("store_slug") or "(none)", row.get("count", 0)))
     else:
-        print_section("Widget Taps by Store Slug")
-        print("  (no widget_tap events in window)")
+        lines.append("  (no widget_tap events in window)")
 
     scoop_actions = scoop_filter_data.get("by_action", []) or []
+    add_section(lines, "Scoop Filter Activity")
     if scoop_actions:
-        print_section("Scoop Filter Activity")
         for row in scoop_actions[:10]:
-            print(fmt_row(row.get("action") or "(none)", row.get("count", 0)))
+            lines.append(fmt_row(row.get("action") or "(none)", row.get("count", 0)))
     else:
-        print_section("Scoop Filter Activity")
-        print("  (no scoop filter activity in window)")
+        lines.append("  (no scoop filter activity in window)")
 
+    add_section(lines, "Referrer Buckets")
     if buckets:
-        print_section("Referrer Buckets")
         for bucket, count in buckets[:10]:
-            print(fmt_row(bucket, count))
+            lines.append(fmt_row(bucket, count))
     else:
-        print_section("Referrer Buckets")
-        print("  (no page_view referrer data yet)")
+        lines.append("  (no page_view referrer data yet)")
+
+    if out is None:
+        _flush(lines)
 
 
 def build_report_text(
@@ -250,28 +328,32 @@ def build_report_text(
     weekly: bool = False,
     widget_data: dict | None = None,
     scoop_filter_data: dict | None = None,
+    run_label: str | None = None,
 ) -> str:
-    """Capture the full report as a string (same output as printing to stdout)."""
-    buf = io.StringIO()
-    with contextlib.redirect_stdout(buf):
-        if weekly:
-            print(f"Custard Weekly Digest  |  {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}")
-            print(f"Window: last {days} days  |  Source: {WORKER_BASE}")
-            report_weekly(events_data or {}, widget_data or {}, scoop_filter_data or {}, days)
-        else:
-            print(f"Custard Telemetry Report  |  {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}")
-            print(f"Window: last {days} days  |  Source: {WORKER_BASE}")
-            if events_data:
-                report_events(events_data)
-            if quiz_data:
-                report_quiz(quiz_data)
-        print()
-    return buf.getvalue()
+    """Build the full report as a string (same output as printing to stdout)."""
+    if run_label is None:
+        run_label = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+    lines: list[str] = []
+    if weekly:
+        lines.append(f"Custard Weekly Digest  |  {run_label}")
+        lines.append(f"Window: last {days} days  |  Source: {WORKER_BASE}")
+        report_weekly(events_data or {}, widget_data or {}, scoop_filter_data or {}, days, out=lines)
+    else:
+        lines.append(f"Custard Telemetry Report  |  {run_label}")
+        lines.append(f"Window: last {days} days  |  Source: {WORKER_BASE}")
+        if events_data:
+            report_events(events_data, out=lines)
+        if quiz_data:
+            report_quiz(quiz_data, out=lines)
+    lines.append("")
+    return "\n".join(lines) + "\n"
 
 
-def send_report_email(body: str, to: str, resend_key: str) -> None:
+def send_report_email(body: str, to: str, resend_key: str, subject_date: str | None = None) -> None:
     """Send the report text as a plain-text email via Resend."""
-    subject = f"Custard Calendar Report — {datetime.now(timezone.utc).strftime('%Y-%m-%d')}"
+    if subject_date is None:
+        subject_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    subject = f"Custard Calendar Report — {subject_date}"
     payload = json.dumps({
         "from": REPORT_FROM_EMAIL,
         "to": [to],
@@ -298,8 +380,8 @@ def send_report_email(body: str, to: str, resend_key: str) -> None:
         raise RuntimeError(f"Network error sending email: {exc.reason}") from exc
 
 
-def write_baseline(events_data: dict, quiz_data: dict, days: int) -> None:
-    now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+def write_baseline(events_data: dict, quiz_data: dict, days: int, run_label: str | None = None) -> None:
+    now = run_label or datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
     t = events_data.get("totals", {})
     qt = quiz_data.get("totals", {})
     total_events = t.get("events", 0)
@@ -322,9 +404,18 @@ def write_baseline(events_data: dict, quiz_data: dict, days: int) -> None:
 _Generated by `scripts/analytics_report.py --baseline`_
 """
 
-    existing = WORKLOG_PATH.read_text(encoding="utf-8") if WORKLOG_PATH.exists() else ""
-    with WORKLOG_PATH.open("w", encoding="utf-8") as f:
-        f.write(existing.rstrip() + "\n" + baseline_block)
+    # The block always lands at the end, so append just the new bytes
+    # instead of read-modify-rewriting the whole (growing) worklog; the
+    # only read is one trailing byte to see if a newline is needed.
+    needs_newline = False
+    if WORKLOG_PATH.exists() and WORKLOG_PATH.stat().st_size > 0:
+        with WORKLOG_PATH.open("rb") as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+    with WORKLOG_PATH.open("a", encoding="utf-8") as f:
+        if needs_newline:
+            f.write("\n")
+        f.write(baseline_block)
 
     print(f"\nBaseline written to {WORKLOG_PATH.name}.")
 
@@ -352,10 +443,16 @@ def main() -> None:
     widget_url = f"{WORKER_BASE}/api/v1/events/summary?days={args.days}&event_type=widget_tap"
     scoop_filter_url = f"{WORKER_BASE}/api/v1/events/summary?days={args.days}&event_type=filter_toggle&page=scoop"
 
+    # One timestamp for the whole run: header, email subject, and
+    # worklog baseline stay consistent instead of drifting across three
+    # separate datetime.now() reads.
+    run_started = datetime.now(timezone.utc)
+    run_label = run_started.strftime("%Y-%m-%d %H:%M UTC")
+
     if args.weekly:
-        print(f"Custard Weekly Digest  |  {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}")
+        print(f"Custard Weekly Digest  |  {run_label}")
     else:
-        print(f"Custard Telemetry Report  |  {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}")
+        print(f"Custard Telemetry Report  |  {run_label}")
     print(f"Window: last {args.days} days  |  Source: {WORKER_BASE}")
 
     events_data: dict = {}
@@ -363,11 +460,25 @@ def main() -> None:
     widget_data: dict = {}
     scoop_filter_data: dict = {}
 
+    # The endpoints this run needs are independent requests to the same
+    # Worker, so fetch them concurrently — total wait is the slowest
+    # endpoint instead of the sum. Reporting below consumes the futures
+    # with the same per-endpoint warning behavior as the serial version.
+    urls = {"events": events_url}
+    if args.weekly:
+        urls["widget"] = widget_url
+        urls["scoop_filter"] = scoop_filter_url
+    else:
+        urls["quiz"] = quiz_url
+
+    with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+        futures = {name: pool.submit(fetch_json, url, args.token) for name, url in urls.items()}
+
     try:
-        events_data = fetch_json(events_url, args.token)
+        events_data = futures["events"].result()
         if args.weekly:
-            widget_data = fetch_json(widget_url, args.token)
-            scoop_filter_data = fetch_json(scoop_filter_url, args.token)
+            widget_data = futures["widget"].result()
+            scoop_filter_data = futures["scoop_filter"].result()
             report_weekly(events_data, widget_data, scoop_filter_data, args.days)
         else:
             report_events(events_data)
@@ -376,13 +487,13 @@ def main() -> None:
 
     if not args.weekly:
         try:
-            quiz_data = fetch_json(quiz_url, args.token)
+            quiz_data = futures["quiz"].result()
             report_quiz(quiz_data)
         except RuntimeError as exc:
             print(f"\nWarning: could not fetch quiz personality index: {exc}", file=sys.stderr)
 
     if args.baseline:
-        write_baseline(events_data, quiz_data, args.days)
+        write_baseline(events_data, quiz_data, args.days, run_label=run_label)
 
     if args.email:
         text = build_report_text(
@@ -392,8 +503,10 @@ def main() -> None:
             weekly=args.weekly,
             widget_data=widget_data,
             scoop_filter_data=scoop_filter_data,
+            run_label=run_label,
         )
-        send_report_email(text, args.email, args.resend_key)
+        send_report_email(text, args.email, args.resend_key,
+                          subject_date=run_started.strftime("%Y-%m-%d"))
 
     print()
 
@@ -16,6 +16,8 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
+import queue
 import sqlite3
 import threading
 import urllib.error
@@ -29,33 +31,122 @@ API_BASES = [
     "https://custard-calendar.chris-kaschner.workers.dev",
 ]
 USER_AGENT = "custard-backfill/2.0"
+
+try:
+    # Rust SIMD JSON parser for the per-store calendar payloads; takes
+    # bytes directly, skipping the utf-8 decode step.
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover
+    _json_loads = json.loads
+
+try:
+    # Keep-alive pool shared by all workers: one TLS handshake per host
+    # instead of one per request. Sized in init_http_pool once the
+    # worker count is known; falls back to plain urlopen without urllib3.
+    import urllib3
+except ImportError:  # pragma: no cover
+    urllib3 = None
+
+_HTTP = None
+
+# Everything fetch_flavors can raise on a failed fetch, for the worker
+# error path.
+_FETCH_ERRORS: tuple = (urllib.error.URLError, TimeoutError, json.JSONDecodeError, RuntimeError)
+if urllib3 is not None:
+    _FETCH_ERRORS += (urllib3.exceptions.HTTPError,)
+
+
+def init_http_pool(workers: int) -> None:
+    global _HTTP  # noqa: PLW0603
+    if urllib3 is not None:
+        _HTTP = urllib3.PoolManager(
+            num_pools=16,
+            maxsize=max(10, workers * 2),
+            retries=False,
+            headers={"User-Agent": USER_AGENT},
+        )
 REFERENCE_DB_PATH = Path("data/backfill/flavors.sqlite")
 OUTPUT_DIR = Path("data/backfill-national")
 OUTPUT_DB_PATH = OUTPUT_DIR / "flavors.sqlite"
 CHECKPOINT_PATH = OUTPUT_DIR / "checkpoint.json"
+CHECKPOINT_LOG_PATH = OUTPUT_DIR / "checkpoint.jsonl"
 MANIFEST_PATH = Path("docs/stores.json")
 
-db_lock = threading.Lock()
+# Per-store checkpoints append one JSONL line (O(1)); the full JSON
+# snapshot is only rewritten at this interval and at shutdown.
+COMPACT_EVERY_STORES = 500
+
 counter_lock = threading.Lock()
-checkpoint_lock = threading.Lock()
-stats = {"success": 0, "failures": 0, "flavors": 0, "done": 0}
+stats = {"success": 0, "failures": 0, "flavors": 0, "done": 0, "last_completed_slug": ""}
+
+# Workers hand completed slugs to a single background flusher via this
+# queue, so no network thread ever blocks on checkpoint JSON or fsync.
+ckpt_q: queue.Queue = queue.Queue()
+
+# Each worker thread writes through its own WAL-mode connection, so
+# there is no Python-level lock around the DB; SQLite serializes the
+# actual page writes itself and fsyncs only at WAL checkpoints.
+_tls = threading.local()
+_worker_conns: list[sqlite3.Connection] = []
+_worker_conns_lock = threading.Lock()
+
+
+def _thread_conn() -> sqlite3.Connection:
+    conn = getattr(_tls, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(OUTPUT_DB_PATH, isolation_level=None, check_same_thread=False)
+        apply_pragmas(conn)
+        _tls.conn = conn
+        with _worker_conns_lock:
+            _worker_conns.append(conn)
+    return conn
+
+
+def close_worker_conns() -> None:
+    with _worker_conns_lock:
+        for conn in _worker_conns:
+            conn.close()
+        _worker_conns.clear()
 
 
 def fetch_flavors(slug: str, timeout: int = 30) -> dict:
     last_err: Exception | None = None
     for base in API_BASES:
         url = f"{base}/api/v1/flavors?slug={slug}"
+        if _HTTP is not None:
+            try:
+                resp = _HTTP.request("GET", url, timeout=timeout)
+                if resp.status >= 400:
+                    last_err = RuntimeError(f"HTTP {resp.status} from {url}")
+                    continue
+                return _json_loads(resp.data)
+            except (urllib3.exceptions.HTTPError, json.JSONDecodeError) as err:
+                last_err = err
+                continue
         req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
         try:
             with urllib.request.urlopen(req, timeout=timeout) as resp:
-                return json.loads(resp.read().decode("utf-8"))
+                return _json_loads(resp.read())
         except (urllib.error.URLError, TimeoutError, json.JSONDecodeError) as err:
             last_err = err
             continue
     raise last_err if last_err else RuntimeError("Unknown fetch failure")
 
 
+def apply_pragmas(conn: sqlite3.Connection) -> None:
+    # WAL + NORMAL: one fsync per commit instead of a full rollback
+    # journal cycle, and readers are never blocked while workers write.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")
+    conn.execute("PRAGMA mmap_size=2147483648")
+    conn.execute("PRAGMA busy_timeout=5000")
+
+
 def ensure_schema(conn: sqlite3.Connection) -> None:
+    apply_pragmas(conn)
     conn.execute(
         """CREATE TABLE IF NOT EXISTS flavors (
                store_slug   TEXT    NOT NULL,
@@ -73,23 +164,90 @@ def ensure_schema(conn: sqlite3.Connection) -> None:
 
 
 def read_existing_slugs(conn: sqlite3.Connection) -> set[str]:
-    return set(r[0] for r in conn.execute("SELECT DISTINCT store_slug FROM flavors").fetchall())
+    # GROUP BY on the leading PK column is an index-skip scan: one row
+    # per distinct slug straight off the index, and iterating the cursor
+    # lazily avoids fetchall() materializing every row first.
+    conn.execute("PRAGMA optimize")
+    return {row[0] for row in conn.execute("SELECT store_slug FROM flavors GROUP BY store_slug")}
 
 
 def load_checkpoint_slugs() -> set[str]:
-    if not CHECKPOINT_PATH.exists():
-        return set()
-    try:
-        payload = json.loads(CHECKPOINT_PATH.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
-        return set()
-    completed = payload.get("completed_slugs", [])
-    if not isinstance(completed, list):
-        return set()
-    return {str(item) for item in completed if isinstance(item, str) and item}
-
-
-def save_checkpoint_slugs(completed_slugs: set[str], last_completed_slug: str) -> None:
+    done: set[str] = set()
+    if CHECKPOINT_PATH.exists():
+        try:
+            payload = json.loads(CHECKPOINT_PATH.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            payload = {}
+        completed = payload.get("completed_slugs", [])
+        if isinstance(completed, list):
+            done = {str(item) for item in completed if isinstance(item, str) and item}
+    # Replay any per-store lines appended since the last compaction.
+    if CHECKPOINT_LOG_PATH.exists():
+        for line in CHECKPOINT_LOG_PATH.read_text(encoding="utf-8").splitlines():
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            slug = entry.get("slug")
+            if isinstance(slug, str) and slug:
+                done.add(slug)
+    return done
+
+
+_checkpoint_log_file = None
+
+
+def append_checkpoint_slug(slug: str) -> None:
+    """Record one completed store as a single appended JSONL line."""
+    global _checkpoint_log_file  # noqa: PLW0603
+    if _checkpoint_log_file is None:
+        OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+        _checkpoint_log_file = CHECKPOINT_LOG_PATH.open("a", encoding="utf-8")
+    _checkpoint_log_file.write(
+        json.dumps({"slug": slug, "at": datetime.now(timezone.utc).isoformat()}) + "\n"
+    )
+    _checkpoint_log_file.flush()
+    os.fsync(_checkpoint_log_file.fileno())
+
+
+def checkpoint_flusher(completed_slugs: set[str]) -> None:
+    """Drain the checkpoint queue, coalescing bursts into one log write pass.
+
+    Runs on its own thread until it sees the None sentinel; the flusher
+    is the only writer of the checkpoint files while workers are live.
+    """
+    since_compact = 0
+    while True:
+        item = ckpt_q.get()
+        if item is None:
+            return
+        batch = [item]
+        saw_sentinel = False
+        while len(batch) < 200:
+            try:
+                nxt = ckpt_q.get_nowait()
+            except queue.Empty:
+                break
+            if nxt is None:
+                saw_sentinel = True
+                break
+            batch.append(nxt)
+
+        for slug in batch:
+            completed_slugs.add(slug)
+            append_checkpoint_slug(slug)
+        stats["last_completed_slug"] = batch[-1]
+        since_compact += len(batch)
+        if since_compact >= COMPACT_EVERY_STORES:
+            compact_checkpoint(completed_slugs, last_completed_slug=batch[-1])
+            since_compact = 0
+        if saw_sentinel:
+            return
+
+
+def compact_checkpoint(completed_slugs: set[str], last_completed_slug: str) -> None:
+    """Rewrite the full checkpoint snapshot and clear the append log."""
+    global _checkpoint_log_file  # noqa: PLW0603
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     payload = {
         "updated_at": datetime.now(timezone.utc).isoformat(),
@@ -100,39 +258,50 @@ def save_checkpoint_slugs(completed_slugs: set[str], last_completed_slug: str) -
     tmp_path = CHECKPOINT_PATH.with_suffix(".tmp")
     tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
     tmp_path.replace(CHECKPOINT_PATH)
+    if _checkpoint_log_file is not None:
+        _checkpoint_log_file.close()
+        _checkpoint_log_file = None
+    CHECKPOINT_LOG_PATH.unlink(missing_ok=True)
 
 
 def process_store(
     slug: str,
-    conn: sqlite3.Connection,
     fetched_at: str,
     total: int,
-    completed_slugs: set[str],
 ) -> None:
     try:
         data = fetch_flavors(slug)
         flavors = data.get("flavors", [])
 
-        with db_lock:
-            for f in flavors:
-                conn.execute(
-                    """INSERT OR IGNORE INTO flavors
-                       (store_slug, flavor_date, title, description, source, fetched_at)
-                       VALUES (?, ?, ?, ?, ?, ?)""",
-                    (
-                        slug,
-                        f.get("date", ""),
-                        f.get("title", ""),
-                        f.get("description", ""),
-                        "worker-api",
-                        fetched_at,
-                    ),
-                )
-            conn.commit()
-
-        with checkpoint_lock:
-            completed_slugs.add(slug)
-            save_checkpoint_slugs(completed_slugs, last_completed_slug=slug)
+        rows = [
+            (
+                slug,
+                f.get("date", ""),
+                f.get("title", ""),
+                f.get("description", ""),
+                "worker-api",
+                fetched_at,
+            )
+            for f in flavors
+        ]
+        # One short transaction per store on this thread's own
+        # connection; in WAL NORMAL mode the commit is cheap (no fsync
+        # until checkpoint) and never blocks the other workers in Python.
+        conn = _thread_conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                """INSERT OR IGNORE INTO flavors
+                   (store_slug, flavor_date, title, description, source, fetched_at)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                rows,
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        ckpt_q.put(slug)
 
         with counter_lock:
             stats["success"] += 1
@@ -141,7 +310,7 @@ def process_store(
             n = stats["done"]
         print(f"[{n}/{total}] {slug}: {len(flavors)} flavors", flush=True)
 
-    except (urllib.error.URLError, TimeoutError, json.JSONDecodeError) as err:
+    except _FETCH_ERRORS as err:
         with counter_lock:
             stats["failures"] += 1
             stats["done"] += 1
@@ -197,22 +366,37 @@ def main() -> int:
         return 0
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    output_conn = sqlite3.connect(OUTPUT_DB_PATH, check_same_thread=False)
+    output_conn = sqlite3.connect(OUTPUT_DB_PATH)
     ensure_schema(output_conn)
 
+    init_http_pool(args.workers)
     fetched_at = datetime.now(timezone.utc).isoformat()
     total = len(target)
     print(f"fetching {total} stores with {args.workers} threads...\n")
 
     completed_slugs = set(output_existing) | set(checkpoint_done)
+    flusher = threading.Thread(target=checkpoint_flusher, args=(completed_slugs,), daemon=True)
+    flusher.start()
+
     with ThreadPoolExecutor(max_workers=args.workers) as pool:
         futures = {
-            pool.submit(process_store, slug, output_conn, fetched_at, total, completed_slugs): slug
+            pool.submit(process_store, slug, fetched_at, total): slug
             for slug in target
         }
         for future in as_completed(futures):
             future.result()  # propagate exceptions
 
+    close_worker_conns()
+
+    ckpt_q.put(None)
+    flusher.join()
+    if stats["last_completed_slug"]:
+        compact_checkpoint(completed_slugs, last_completed_slug=stats["last_completed_slug"])
+
+    # Refresh query-planner stats cheaply before shutdown (no-op cost
+    # when nothing changed enough to matter).
+    output_conn.execute("PRAGMA analysis_limit=400")
+    output_conn.execute("PRAGMA optimize")
     output_conn.close()
     reference_conn.close()
     print(f"\ndone: success={stats['success']} failures={stats['failures']} flavors_added={stats['flavors']}")
@@ -16,17 +16,20 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import gzip
 import html
 import json
+import os
+import queue
 import random
-import re
 import sqlite3
 import threading
 import time
 import urllib.error
 import urllib.parse
 import urllib.request
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import date, datetime, timezone
 from pathlib import Path
 
@@ -35,29 +38,90 @@ CDX_APIS = [
     "http://web.archive.org/cdx/search/cdx",
 ]
 USER_AGENT = "custard-wayback-backfill/1.0"
+
+try:
+    # Rust SIMD JSON parser; the __NEXT_DATA__ blobs run 200 KB+ per
+    # snapshot and CDX responses are large arrays, so decode speed is
+    # material. Takes bytes directly, skipping the utf-8 decode step.
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover
+    _json_loads = json.loads
+
+try:
+    # Keep-alive pool shared by all workers: the playback host is always
+    # web.archive.org, so one TLS handshake is amortized across every
+    # capture of every store. Sized in init_http_pool once the worker
+    # count is known; falls back to plain urlopen without urllib3.
+    import urllib3
+except ImportError:  # pragma: no cover
+    urllib3 = None
+
+_HTTP = None
+
+
+def init_http_pool(workers: int) -> None:
+    global _HTTP  # noqa: PLW0603
+    if urllib3 is not None:
+        _HTTP = urllib3.PoolManager(
+            num_pools=16,
+            maxsize=max(10, workers * 2),
+            retries=False,
+            # Archived pages compress 5-10x; urllib3 inflates
+            # transparently, the urlopen fallback decompresses by hand.
+            headers={"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate"},
+        )
 MANIFEST_PATH = Path("docs/stores.json")
 OUTPUT_DIR = Path("data/backfill-wayback")
 OUTPUT_DB_PATH = OUTPUT_DIR / "flavors.sqlite"
 CHECKPOINT_PATH = OUTPUT_DIR / "checkpoint.json"
+CHECKPOINT_LOG_PATH = OUTPUT_DIR / "checkpoint.jsonl"
 
-NON_CULVERS_PATTERNS = [
-    re.compile(r"^kopps-"),
-    re.compile(r"^gilles$"),
-    re.compile(r"^hefners$"),
-    re.compile(r"^kraverz$"),
-    re.compile(r"^oscars"),
-]
+# Per-store checkpoints append one JSONL line (O(1)); the full JSON
+# snapshot is only rewritten at this interval and at shutdown.
+COMPACT_EVERY_STORES = 500
 
-NEXT_DATA_RE = re.compile(r'<script\s+id="__NEXT_DATA__"[^>]*>([\s\S]*?)</script>')
-LEGACY_FOTD_RE = re.compile(
-    r'<a[^>]*class="value"[^>]*>(?P<title>[^<]+)</a>[\s\S]{0,2500}?'
-    r'/fotd-add-to-calendar/\d+/(?P<date>\d{4}-\d{2}-\d{2})',
-    re.IGNORECASE,
-)
+# Anchored prefix/exact tests, so plain str methods beat a regex loop.
+NON_CULVERS_PREFIXES = ("kopps-", "oscars")
+NON_CULVERS_EXACT = frozenset({"gilles", "hefners", "kraverz"})
+
+# Legacy pages pair an <a class="value">Title</a> with a
+# /fotd-add-to-calendar/<id>/<date> link within ~2500 chars; both ends
+# are fixed literals, so a two-anchor str.find/rfind scan replaces the
+# old backtracking regex.
+LEGACY_FOTD_MARKER = "/fotd-add-to-calendar/"
+LEGACY_FOTD_WINDOW = 2500
 
-db_lock = threading.Lock()
-checkpoint_lock = threading.Lock()
 counter_lock = threading.Lock()
+
+# Workers hand completed slugs to a single background flusher via this
+# queue, so no network thread ever blocks on checkpoint JSON or fsync.
+ckpt_q: queue.Queue = queue.Queue()
+
+# Each worker thread writes through its own WAL-mode connection, so
+# there is no Python-level lock around the DB; SQLite serializes the
+# actual page writes itself and fsyncs only at WAL checkpoints.
+_tls = threading.local()
+_worker_conns: list[sqlite3.Connection] = []
+_worker_conns_lock = threading.Lock()
+
+
+def _thread_conn() -> sqlite3.Connection:
+    conn = getattr(_tls, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(OUTPUT_DB_PATH, isolation_level=None, check_same_thread=False)
+        apply_pragmas(conn)
+        _tls.conn = conn
+        with _worker_conns_lock:
+            _worker_conns.append(conn)
+    return conn
+
+
+def close_worker_conns() -> None:
+    with _worker_conns_lock:
+        for conn in _worker_conns:
+            conn.close()
+        _worker_conns.clear()
 stats = {
     "stores_done": 0,
     "stores_ok": 0,
@@ -66,8 +130,15 @@ stats = {
     "snapshots_parsed": 0,
     "snapshots_fetch_errors": 0,
     "flavors_upserted": 0,
+    "snapshots_deduped": 0,
 }
 
+# Identical archived bodies share a CDX digest, so one parse serves every
+# repeat capture process-wide (Wayback archives the page daily; it only
+# changes about weekly).
+_parsed_by_digest: dict[str, list[dict[str, str]]] = {}
+_parsed_by_digest_lock = threading.Lock()
+
 
 class RateLimiter:
     """Simple thread-safe request pacer (requests per minute)."""
@@ -106,10 +177,7 @@ def clean_text(text: str) -> str:
 
 
 def is_culvers_slug(slug: str) -> bool:
-    for pattern in NON_CULVERS_PATTERNS:
-        if pattern.search(slug):
-            return False
-    return True
+    return not (slug in NON_CULVERS_EXACT or slug.startswith(NON_CULVERS_PREFIXES))
 
 
 def wb_timestamp_to_iso(ts: str) -> str:
@@ -120,8 +188,7 @@ def wb_timestamp_to_iso(ts: str) -> str:
     return dt.isoformat()
 
 
-def _parse_retry_after_seconds(err: urllib.error.HTTPError) -> float | None:
-    header = err.headers.get("Retry-After") if err.headers else None
+def _parse_retry_after(header: str | None) -> float | None:
     if not header:
         return None
     try:
@@ -130,13 +197,34 @@ def _parse_retry_after_seconds(err: urllib.error.HTTPError) -> float | None:
         return None
 
 
+def _parse_retry_after_seconds(err: urllib.error.HTTPError) -> float | None:
+    return _parse_retry_after(err.headers.get("Retry-After") if err.headers else None)
+
+
+_tls_random = threading.local()
+
+
+def _rng() -> random.Random:
+    """Per-thread RNG: the module-level random shares one lock, which
+    serializes workers when a 429 storm has everyone computing backoff."""
+    rng = getattr(_tls_random, "rng", None)
+    if rng is None:
+        rng = random.Random(threading.get_ident())
+        _tls_random.rng = rng
+    return rng
+
+
 def _compute_backoff_s(attempt: int, base: float = 2.0, cap: float = 90.0) -> float:
     exp = min(cap, base * (2 ** (attempt - 1)))
-    jitter = random.uniform(0.0, min(3.0, exp * 0.25))
+    jitter = _rng().uniform(0.0, min(3.0, exp * 0.25))
     return min(cap, exp + jitter)
 
 
-def _is_connection_refused(err: urllib.error.URLError) -> bool:
+class PermanentHTTPError(RuntimeError):
+    """4xx response that retries can never fix (e.g. 404/410)."""
+
+
+def _is_connection_refused(err: Exception) -> bool:
     text = str(err).lower()
     return "connection refused" in text or "failed to connect" in text
 
@@ -146,21 +234,59 @@ def fetch_url(
     timeout: int = 45,
     retries: int = 6,
     limiter: RateLimiter | None = None,
+    backoff_offset: int = 0,
 ) -> bytes:
     last_err: Exception | None = None
 
     for attempt in range(1, retries + 1):
+        if limiter is not None:
+            limiter.wait()
+
+        if _HTTP is not None:
+            try:
+                resp = _HTTP.request("GET", url, timeout=timeout)
+            except urllib3.exceptions.HTTPError as err:
+                last_err = err
+                if attempt < retries:
+                    if _is_connection_refused(err):
+                        sleep_s = _compute_backoff_s(attempt + backoff_offset, base=8.0, cap=240.0)
+                    else:
+                        sleep_s = _compute_backoff_s(attempt + backoff_offset)
+                    time.sleep(sleep_s)
+                    continue
+                break
+            if resp.status >= 400:
+                if resp.status in (404, 410):
+                    raise PermanentHTTPError(f"HTTP {resp.status}: {url}")
+                last_err = RuntimeError(f"HTTP {resp.status}: {url}")
+                if resp.status in (429, 500, 502, 503, 504) and attempt < retries:
+                    retry_after = _parse_retry_after(resp.headers.get("Retry-After"))
+                    sleep_s = retry_after if retry_after is not None else _compute_backoff_s(attempt + backoff_offset)
+                    time.sleep(max(0.5, sleep_s))
+                    continue
+                break
+            return resp.data
+
         try:
-            if limiter is not None:
-                limiter.wait()
-            req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+            req = urllib.request.Request(
+                url,
+                headers={"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate"},
+            )
             with urllib.request.urlopen(req, timeout=timeout) as resp:
-                return resp.read()
+                raw = resp.read()
+                encoding = resp.headers.get("Content-Encoding", "")
+                if encoding == "gzip":
+                    raw = gzip.decompress(raw)
+                elif encoding == "deflate":
+                    raw = zlib.decompress(raw)
+                return raw
         except urllib.error.HTTPError as err:
+            if err.code in (404, 410):
+                raise PermanentHTTPError(f"HTTP {err.code}: {url}") from err
             last_err = err
             if err.code in (429, 500, 502, 503, 504) and attempt < retries:
                 retry_after = _parse_retry_after_seconds(err)
-                sleep_s = retry_after if retry_after is not None else _compute_backoff_s(attempt)
+                sleep_s = retry_after if retry_after is not None else _compute_backoff_s(attempt + backoff_offset)
                 time.sleep(max(0.5, sleep_s))
                 continue
             break
@@ -168,9 +294,9 @@ def fetch_url(
             last_err = err
             if attempt < retries:
                 if isinstance(err, urllib.error.URLError) and _is_connection_refused(err):
-                    sleep_s = _compute_backoff_s(attempt, base=8.0, cap=240.0)
+                    sleep_s = _compute_backoff_s(attempt + backoff_offset, base=8.0, cap=240.0)
                 else:
-                    sleep_s = _compute_backoff_s(attempt)
+                    sleep_s = _compute_backoff_s(attempt + backoff_offset)
                 time.sleep(sleep_s)
                 continue
             break
@@ -183,13 +309,15 @@ def fetch_cdx_snapshots(
     from_year: int,
     to_year: int,
     max_snapshots: int = 0,
-) -> list[tuple[str, str]]:
+) -> list[tuple[str, str, str]]:
     original_url = f"https://www.culvers.com/restaurants/{slug}"
     params = [
         ("url", original_url),
         ("from", str(from_year)),
         ("to", str(to_year)),
-        ("output", "json"),
+        # Default text output: one space-separated capture per line.
+        # Parsed line-by-line below instead of materializing the whole
+        # response as one JSON list-of-lists.
         ("fl", "timestamp,original,statuscode,mimetype,digest"),
         ("filter", "statuscode:200"),
         ("filter", "mimetype:text/html"),
@@ -209,20 +337,19 @@ def fetch_cdx_snapshots(
     if payload is None:
         raise last_err if last_err else RuntimeError("Failed to fetch CDX snapshots")
 
-    rows = json.loads(payload.decode("utf-8"))
-    if not isinstance(rows, list) or len(rows) <= 1:
-        return []
-
-    # First row is header; each row: [timestamp, original, statuscode, mimetype, digest]
-    captures: list[tuple[str, str]] = []
-    for row in rows[1:]:
-        if not isinstance(row, list) or len(row) < 2:
+    # Each line: "timestamp original statuscode mimetype digest".
+    captures: list[tuple[str, str, str]] = []
+    for line in payload.decode("utf-8", errors="replace").splitlines():
+        if not line:
             continue
-        ts = str(row[0])
-        original = str(row[1])
+        parts = line.split(" ")
+        if len(parts) < 2:
+            continue
+        ts, original = parts[0], parts[1]
         if len(ts) != 14:
             continue
-        captures.append((ts, original))
+        digest = parts[4] if len(parts) > 4 else ""
+        captures.append((ts, original, digest))
 
     captures.sort(key=lambda x: x[0])
     if max_snapshots > 0:
@@ -231,11 +358,17 @@ def fetch_cdx_snapshots(
 
 
 def parse_flavors_from_html(page_html: str) -> list[dict[str, str]]:
-    match = NEXT_DATA_RE.search(page_html)
-    if not match:
+    # The marker is a fixed literal, so plain str.find beats scanning
+    # ~500 KB of HTML with a non-greedy regex on every snapshot.
+    i = page_html.find('id="__NEXT_DATA__"')
+    if i == -1:
+        return parse_flavors_from_legacy_html(page_html)
+    j = page_html.find(">", i) + 1
+    k = page_html.find("</script>", j)
+    if j == 0 or k == -1:
         return parse_flavors_from_legacy_html(page_html)
 
-    data = json.loads(match.group(1))
+    data = _json_loads(page_html[j:k])
     props = data.get("props") or data
     custom_data = (
         props.get("pageProps", {})
@@ -266,12 +399,42 @@ def parse_flavors_from_html(page_html: str) -> list[dict[str, str]]:
 
 def parse_flavors_from_legacy_html(page_html: str) -> list[dict[str, str]]:
     found: dict[str, str] = {}
-    for match in LEGACY_FOTD_RE.finditer(page_html):
-        flavor_date = match.group("date")
-        title = clean_text(html.unescape(match.group("title")))
-        if not flavor_date or not title:
+    lower = page_html.lower()
+    i = 0
+    while True:
+        i = lower.find(LEGACY_FOTD_MARKER, i)
+        if i == -1:
+            break
+        pos = i + len(LEGACY_FOTD_MARKER)
+
+        # Numeric id, then "/YYYY-MM-DD".
+        id_end = pos
+        while id_end < len(page_html) and page_html[id_end].isdigit():
+            id_end += 1
+        i = pos
+        if id_end == pos or page_html[id_end:id_end + 1] != "/":
+            continue
+        flavor_date = page_html[id_end + 1:id_end + 11]
+        try:
+            date.fromisoformat(flavor_date)
+        except ValueError:
             continue
-        found[flavor_date] = title
+
+        # Nearest preceding <a ... class="value">Title</a> in the window.
+        window_start = max(0, i - LEGACY_FOTD_WINDOW)
+        j = lower.rfind('class="value"', window_start, i)
+        if j == -1:
+            continue
+        a_open = lower.rfind("<a", window_start, j)
+        if a_open == -1 or ">" in page_html[a_open:j]:
+            continue
+        gt = page_html.find(">", j)
+        close = lower.find("</a>", gt)
+        if gt == -1 or close == -1:
+            continue
+        title = clean_text(html.unescape(page_html[gt + 1:close]))
+        if title and "<" not in title:
+            found[flavor_date] = title
 
     return [
         {"date": d, "title": t, "description": ""}
@@ -287,21 +450,42 @@ def fetch_archived_html(ts: str, original: str) -> str:
         f"http://web.archive.org/web/{ts}/{original}",
     ]
     last_err: Exception | None = None
-    for candidate in candidates:
+    for idx, candidate in enumerate(candidates):
         try:
+            # backoff_offset carries the wait schedule across candidates:
+            # once the first URL form has backed off to 90s, the next form
+            # resumes from there instead of restarting at 2s.
             return fetch_url(
                 candidate,
                 timeout=60,
                 retries=5,
                 limiter=playback_rate_limiter,
+                backoff_offset=idx * 2,
             ).decode("utf-8", errors="ignore")
+        except PermanentHTTPError:
+            # 404/410 means the capture is simply gone; the other URL
+            # forms serve the same snapshot, so trying them only burns
+            # retries. Empty HTML parses to "no flavors" downstream.
+            return ""
         except Exception as err:  # noqa: BLE001
             last_err = err
             continue
     raise last_err if last_err else RuntimeError("Unable to fetch archived HTML")
 
 
+def apply_pragmas(conn: sqlite3.Connection) -> None:
+    # WAL + NORMAL: one fsync per commit instead of a full rollback
+    # journal cycle, and readers are never blocked while workers write.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")
+    conn.execute("PRAGMA mmap_size=2147483648")
+    conn.execute("PRAGMA busy_timeout=5000")
+
+
 def ensure_schema(conn: sqlite3.Connection) -> None:
+    apply_pragmas(conn)
     conn.execute(
         """CREATE TABLE IF NOT EXISTS flavors (
                store_slug   TEXT    NOT NULL,
@@ -319,19 +503,81 @@ def ensure_schema(conn: sqlite3.Connection) -> None:
 
 
 def load_checkpoint() -> set[str]:
-    if not CHECKPOINT_PATH.exists():
-        return set()
-    try:
-        payload = json.loads(CHECKPOINT_PATH.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
-        return set()
-    done = payload.get("completed_slugs", [])
-    if not isinstance(done, list):
-        return set()
-    return {str(s) for s in done if isinstance(s, str) and s}
+    done: set[str] = set()
+    if CHECKPOINT_PATH.exists():
+        try:
+            payload = json.loads(CHECKPOINT_PATH.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            payload = {}
+        completed = payload.get("completed_slugs", [])
+        if isinstance(completed, list):
+            done = {str(s) for s in completed if isinstance(s, str) and s}
+    # Replay any per-store lines appended since the last compaction.
+    if CHECKPOINT_LOG_PATH.exists():
+        for line in CHECKPOINT_LOG_PATH.read_text(encoding="utf-8").splitlines():
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            slug = entry.get("slug")
+            if isinstance(slug, str) and slug:
+                done.add(slug)
+    return done
+
+
+_checkpoint_log_file = None
+
+
+def append_checkpoint_slug(slug: str) -> None:
+    """Record one completed store as a single appended JSONL line."""
+    global _checkpoint_log_file  # noqa: PLW0603
+    if _checkpoint_log_file is None:
+        OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+        _checkpoint_log_file = CHECKPOINT_LOG_PATH.open("a", encoding="utf-8")
+    _checkpoint_log_file.write(
+        json.dumps({"slug": slug, "at": datetime.now(timezone.utc).isoformat()}) + "\n"
+    )
+    _checkpoint_log_file.flush()
+    os.fsync(_checkpoint_log_file.fileno())
+
+
+def checkpoint_flusher(completed: set[str], selector: str) -> None:
+    """Drain the checkpoint queue, coalescing bursts into one log write pass.
+
+    Runs on its own thread until it sees the None sentinel; the flusher
+    is the only writer of the checkpoint files while workers are live.
+    """
+    since_compact = 0
+    while True:
+        item = ckpt_q.get()
+        if item is None:
+            return
+        batch = [item]
+        saw_sentinel = False
+        while len(batch) < 200:
+            try:
+                nxt = ckpt_q.get_nowait()
+            except queue.Empty:
+                break
+            if nxt is None:
+                saw_sentinel = True
+                break
+            batch.append(nxt)
+
+        for slug in batch:
+            completed.add(slug)
+            append_checkpoint_slug(slug)
+        since_compact += len(batch)
+        if since_compact >= COMPACT_EVERY_STORES:
+            compact_checkpoint(completed, selector=selector)
+            since_compact = 0
+        if saw_sentinel:
+            return
 
 
-def save_checkpoint(completed: set[str], selector: str) -> None:
+def compact_checkpoint(completed: set[str], selector: str) -> None:
+    """Rewrite the full checkpoint snapshot and clear the append log."""
+    global _checkpoint_log_file  # noqa: PLW0603
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     payload = {
         "updated_at": datetime.now(timezone.utc).isoformat(),
@@ -343,83 +589,122 @@ def save_checkpoint(completed: set[str], selector: str) -> None:
     tmp = CHECKPOINT_PATH.with_suffix(".tmp")
     tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
     tmp.replace(CHECKPOINT_PATH)
+    if _checkpoint_log_file is not None:
+        _checkpoint_log_file.close()
+        _checkpoint_log_file = None
+    CHECKPOINT_LOG_PATH.unlink(missing_ok=True)
 
 
 def upsert_store_rows(
-    conn: sqlite3.Connection,
     slug: str,
     rows_by_date: dict[str, tuple[str, str, str]],
 ) -> int:
     if not rows_by_date:
         return 0
 
-    with db_lock:
-        for flavor_date, (title, description, fetched_at) in rows_by_date.items():
-            conn.execute(
-                """INSERT INTO flavors
-                   (store_slug, flavor_date, title, description, source, fetched_at)
-                   VALUES (?, ?, ?, ?, ?, ?)
-                   ON CONFLICT(store_slug, flavor_date) DO UPDATE SET
-                     title=excluded.title,
-                     description=excluded.description,
-                     source=excluded.source,
-                     fetched_at=excluded.fetched_at""",
-                (slug, flavor_date, title, description, "wayback", fetched_at),
-            )
-        conn.commit()
+    rows = [
+        (slug, flavor_date, title, description, "wayback", fetched_at)
+        for flavor_date, (title, description, fetched_at) in rows_by_date.items()
+    ]
+    # One short transaction per store on this thread's own connection;
+    # in WAL NORMAL mode the commit is cheap (no fsync until checkpoint)
+    # and never blocks the other workers in Python.
+    conn = _thread_conn()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany(
+            """INSERT INTO flavors
+               (store_slug, flavor_date, title, description, source, fetched_at)
+               VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT(store_slug, flavor_date) DO UPDATE SET
+                 title=excluded.title,
+                 description=excluded.description,
+                 source=excluded.source,
+                 fetched_at=excluded.fetched_at""",
+            rows,
+        )
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
 
     return len(rows_by_date)
 
 
-def process_store(
+def lookup_store_captures(
     slug: str,
-    conn: sqlite3.Connection,
-    total: int,
-    completed: set[str],
     from_year: int,
     to_year: int,
     max_snapshots: int,
+) -> list[tuple[str, str, str]]:
+    """CDX stage: list a store's captures (cheap, cdx-rate-limited)."""
+    captures = fetch_cdx_snapshots(
+        slug=slug,
+        from_year=from_year,
+        to_year=to_year,
+        max_snapshots=max_snapshots,
+    )
+    with counter_lock:
+        stats["snapshots_seen"] += len(captures)
+    return captures
+
+
+def finish_store(
+    slug: str,
+    total: int,
+    fetches: list[tuple[str, str, Future]],
     before_date: date | None,
-    selector: str,
 ) -> None:
+    """Playback stage: parse fetched snapshots, upsert, checkpoint.
+
+    `fetches` pairs each capture timestamp and digest with the in-flight
+    fetch_archived_html future; waiting on them here keeps the playback
+    pool saturated while stores complete in whatever order they finish.
+    Captures sharing a digest share one future, so each distinct body is
+    downloaded and parsed once.
+    """
     try:
-        captures = fetch_cdx_snapshots(
-            slug=slug,
-            from_year=from_year,
-            to_year=to_year,
-            max_snapshots=max_snapshots,
-        )
-        with counter_lock:
-            stats["snapshots_seen"] += len(captures)
-
         rows_by_date: dict[str, tuple[str, str, str]] = {}
+        before_date_iso = before_date.isoformat() if before_date is not None else None
         parsed_snapshots = 0
         capture_errors = 0
-        for ts, original in captures:
+        for ts, digest, html_future in fetches:
             try:
-                html_text = fetch_archived_html(ts, original)
+                html_text = html_future.result()
             except Exception:  # noqa: BLE001
                 capture_errors += 1
                 continue
 
-            flavors = parse_flavors_from_html(html_text)
+            flavors = None
+            if digest:
+                with _parsed_by_digest_lock:
+                    flavors = _parsed_by_digest.get(digest)
+            if flavors is None:
+                flavors = parse_flavors_from_html(html_text)
+                if digest:
+                    with _parsed_by_digest_lock:
+                        _parsed_by_digest[digest] = flavors
             if not flavors:
                 continue
             parsed_snapshots += 1
             fetched_at = wb_timestamp_to_iso(ts)
             for f in flavors:
                 f_date = f["date"]
-                if before_date is not None:
+                if before_date_iso is not None:
+                    # ISO dates sort lexicographically, so the cutoff is
+                    # a plain string compare; fromisoformat (one C call,
+                    # vs strptime's locale machinery) only validates the
+                    # survivors.
+                    if f_date >= before_date_iso:
+                        continue
                     try:
-                        parsed_date = datetime.strptime(f_date, "%Y-%m-%d").date()
+                        date.fromisoformat(f_date)
                     except ValueError:
                         continue
-                    if parsed_date >= before_date:
-                        continue
                 # Keep latest observation for each flavor date within this store run.
                 rows_by_date[f_date] = (f["title"], f["description"], fetched_at)
 
-        upserted = upsert_store_rows(conn, slug, rows_by_date)
+        upserted = upsert_store_rows(slug, rows_by_date)
         with counter_lock:
             stats["snapshots_parsed"] += parsed_snapshots
             stats["snapshots_fetch_errors"] += capture_errors
@@ -428,12 +713,10 @@ def process_store(
             stats["stores_done"] += 1
             done_n = stats["stores_done"]
 
-        with checkpoint_lock:
-            completed.add(slug)
-            save_checkpoint(completed, selector=selector)
+        ckpt_q.put(slug)
 
         print(
-            f"[{done_n}/{total}] {slug}: captures={len(captures)} "
+            f"[{done_n}/{total}] {slug}: captures={len(fetches)} "
             f"parsed={parsed_snapshots} capture_errors={capture_errors} upserted_dates={upserted}",
             flush=True,
         )
@@ -502,6 +785,7 @@ def main() -> int:
     global playback_rate_limiter  # noqa: PLW0603
     cdx_rate_limiter = RateLimiter(args.cdx_rpm)
     playback_rate_limiter = RateLimiter(args.playback_rpm)
+    init_http_pool(args.workers)
 
     manifest = json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
     state = str(args.state).upper().strip()
@@ -544,36 +828,86 @@ def main() -> int:
         return 0
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(OUTPUT_DB_PATH, check_same_thread=False)
+    conn = sqlite3.connect(OUTPUT_DB_PATH)
     ensure_schema(conn)
 
     total = len(target)
     print(f"fetching {total} stores with {args.workers} workers...\n")
 
-    with ThreadPoolExecutor(max_workers=args.workers) as pool:
-        futures = {
-            pool.submit(
-                process_store,
+    flusher = threading.Thread(target=checkpoint_flusher, args=(completed, selector), daemon=True)
+    flusher.start()
+
+    # Two pools so the cheap CDX lookups never sit behind slow playback
+    # fetches: CDX results stream in and fan their captures out to the
+    # playback pool, which stays saturated up to its rate limit.
+    with ThreadPoolExecutor(max_workers=args.workers) as cdx_pool, ThreadPoolExecutor(
+        max_workers=args.workers * 2
+    ) as playback_pool:
+        cdx_futures = {
+            cdx_pool.submit(
+                lookup_store_captures,
                 slug,
-                conn,
-                total,
-                completed,
                 args.from_year,
                 args.to_year,
                 args.max_snapshots_per_store,
-                before_date,
-                selector,
             ): slug
             for slug in target
         }
-        for future in as_completed(futures):
-            future.result()
-
+        staged: list[tuple[str, list[tuple[str, str, Future]]]] = []
+        for future in as_completed(cdx_futures):
+            slug = cdx_futures[future]
+            try:
+                captures = future.result()
+            except Exception as err:  # noqa: BLE001
+                with counter_lock:
+                    stats["stores_failed"] += 1
+                    stats["stores_done"] += 1
+                    done_n = stats["stores_done"]
+                print(f"[{done_n}/{total}] {slug}: ERROR {err}", flush=True)
+                continue
+            # Captures with a digest already in flight for this store are
+            # byte-identical bodies; point them at the existing future
+            # rather than spending another slot of the playback budget.
+            future_by_digest: dict[str, Future] = {}
+            fetches: list[tuple[str, str, Future]] = []
+            deduped = 0
+            for ts, original, digest in captures:
+                html_future = future_by_digest.get(digest) if digest else None
+                if html_future is None:
+                    html_future = playback_pool.submit(fetch_archived_html, ts, original)
+                    if digest:
+                        future_by_digest[digest] = html_future
+                else:
+                    deduped += 1
+                fetches.append((ts, digest, html_future))
+            if deduped:
+                with counter_lock:
+                    stats["snapshots_deduped"] += deduped
+            staged.append((slug, fetches))
+        # Drain rather than iterate: popping each entry lets a finished
+        # store's futures (and their decoded HTML bodies) be collected
+        # while later stores are still fetching, keeping the resident
+        # set at roughly one store instead of the whole run.
+        while staged:
+            slug, fetches = staged.pop(0)
+            finish_store(slug, total, fetches, before_date)
+
+    close_worker_conns()
+
+    ckpt_q.put(None)
+    flusher.join()
+    if completed:
+        compact_checkpoint(completed, selector=selector)
+    # Refresh query-planner stats cheaply before shutdown (no-op cost
+    # when nothing changed enough to matter).
+    conn.execute("PRAGMA analysis_limit=400")
+    conn.execute("PRAGMA optimize")
     conn.close()
     print(
         "\ndone: "
         f"stores_ok={stats['stores_ok']} stores_failed={stats['stores_failed']} "
         f"snapshots_seen={stats['snapshots_seen']} snapshots_parsed={stats['snapshots_parsed']} "
+        f"snapshots_deduped={stats['snapshots_deduped']} "
         f"snapshots_fetch_errors={stats['snapshots_fetch_errors']} "
         f"flavor_dates_upserted={stats['flavors_upserted']}"
     )
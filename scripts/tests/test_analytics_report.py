@@ -59,6 +59,17 @@ class TestFmtRow:
 
 
 class TestFetchJson:
+    def _mock_pool(self, response_data: dict, status: int = 200):
+        """Return a mock urllib3 pool whose request() yields a canned response."""
+        import unittest.mock as mock
+        resp = mock.MagicMock()
+        resp.status = status
+        resp.data = (json.dumps(response_data).encode()
+                     if isinstance(response_data, dict) else response_data)
+        pool = mock.MagicMock()
+        pool.request = mock.Mock(return_value=resp)
+        return pool
+
     def _mock_response(self, response_data: dict):
         """Return a context-manager mock for urllib.request.urlopen."""
         import unittest.mock as mock
@@ -70,23 +81,59 @@ class TestFetchJson:
         return cm
 
     def test_returns_mapped_json(self):
-        cm = self._mock_response({"ok": True, "count": 3})
-        with patch("urllib.request.urlopen", return_value=cm):
+        pool = self._mock_pool({"ok": True, "count": 3})
+        with patch("scripts.analytics_report._POOL", pool):
             data = fetch_json("https://example.com/data", "token-123")
         assert data["ok"] is True
         assert data["count"] == 3
 
     def test_sends_auth_and_user_agent_headers(self):
-        cm = self._mock_response({"ok": True})
-        with patch("urllib.request.urlopen", return_value=cm) as mock_open:
+        pool = self._mock_pool({"ok": True})
+        with patch("scripts.analytics_report._POOL", pool):
             fetch_json("https://example.com/data", "token-abc")
 
-        req = mock_open.call_args[0][0]
-        headers = {k.lower(): v for k, v in req.header_items()}
+        headers = {k.lower(): v for k, v in pool.request.call_args.kwargs["headers"].items()}
         assert headers["authorization"] == "Bearer token-abc"
         assert headers["user-agent"] == "custard-analytics-report/1.0"
 
     def test_raises_on_http_error(self):
+        pool = self._mock_pool(b"error code: 1010", status=403)
+        with patch("scripts.analytics_report._POOL", pool):
+            with pytest.raises(RuntimeError, match="HTTP 403"):
+                fetch_json("https://example.com/data", "token")
+
+    def test_raises_on_network_error(self):
+        import unittest.mock as mock
+        import urllib3
+        pool = mock.MagicMock()
+        pool.request = mock.Mock(side_effect=urllib3.exceptions.HTTPError("connection failed"))
+        with patch("scripts.analytics_report._POOL", pool):
+            with pytest.raises(RuntimeError, match="Network error"):
+                fetch_json("https://example.com/data", "token")
+
+    def test_urlopen_fallback_without_urllib3(self):
+        cm = self._mock_response({"ok": True})
+        with patch("scripts.analytics_report._POOL", None), \
+                patch("urllib.request.urlopen", return_value=cm) as mock_open:
+            data = fetch_json("https://example.com/data", "token-abc")
+
+        assert data["ok"] is True
+        req = mock_open.call_args[0][0]
+        headers = {k.lower(): v for k, v in req.header_items()}
+        assert headers["authorization"] == "Bearer token-abc"
+
+    def test_urlopen_fallback_decodes_gzip_body(self):
+        import gzip
+        import unittest.mock as mock
+        cm = self._mock_response({})
+        cm.read = mock.Mock(return_value=gzip.compress(json.dumps({"ok": True}).encode()))
+        cm.headers = {"Content-Encoding": "gzip"}
+        with patch("scripts.analytics_report._POOL", None), \
+                patch("urllib.request.urlopen", return_value=cm):
+            data = fetch_json("https://example.com/data", "token")
+        assert data["ok"] is True
+
+    def test_urlopen_fallback_raises_on_http_error(self):
         from io import BytesIO
         err = urllib.error.HTTPError(
             url="https://example.com/data",
@@ -95,16 +142,11 @@ class TestFetchJson:
             hdrs={},
             fp=BytesIO(b"error code: 1010"),
         )
-        with patch("urllib.request.urlopen", side_effect=err):
+        with patch("scripts.analytics_report._POOL", None), \
+                patch("urllib.request.urlopen", side_effect=err):
             with pytest.raises(RuntimeError, match="HTTP 403"):
                 fetch_json("https://example.com/data", "token")
 
-    def test_raises_on_url_error(self):
-        err = urllib.error.URLError("connection failed")
-        with patch("urllib.request.urlopen", side_effect=err):
-            with pytest.raises(RuntimeError, match="Network error"):
-                fetch_json("https://example.com/data", "token")
-
 
 class TestReportEvents:
     def _make_data(self, **overrides):
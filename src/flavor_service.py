@@ -9,6 +9,7 @@ and Tidbyt Render consumers read from this cache.
 import os
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -121,17 +122,31 @@ def fetch_and_cache(config: Dict, cache_path: str = None) -> Dict:
         'locations': {},
     }
 
+    valid_stores = []
     for store in stores:
-        slug = store.get('slug', '')
+        if not store.get('slug'):
+            logger.error(f"No slug for store: {store.get('name', '')}")
+            continue
+        valid_stores.append(store)
+
+    # Store fetches (primary + backup) are independent, network-bound
+    # Worker calls, so run them concurrently; total fetch time becomes
+    # the slowest store instead of the sum. Results are collected back
+    # in config order so the cache layout is unchanged.
+    futures = {}
+    if valid_stores:
+        with ThreadPoolExecutor(max_workers=min(4, len(valid_stores))) as pool:
+            for store in valid_stores:
+                slug = store['slug']
+                futures[slug] = pool.submit(fetch_flavors_from_api, slug, worker_base)
+
+    for store in valid_stores:
+        slug = store['slug']
         name = store.get('name', slug)
         role = store.get('role', '')
 
-        if not slug:
-            logger.error(f"No slug for store: {name}")
-            continue
-
         try:
-            flavors = fetch_flavors_from_api(slug, worker_base)
+            flavors = futures[slug].result()
 
             cache_data['locations'][slug] = {
                 'name': name,
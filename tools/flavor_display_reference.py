@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Reference implementation of the Tidbyt flavor display formatter.
+
+Ports format_flavor_for_display from tidbyt/culvers_fotd.star — the
+hand-tuned special-case flavors, the abbreviation table, and the
+5-character line cap of the 3-cone view — so formatting changes can be
+checked off-device by diffing this script's output.
+"""
+
+import functools
+import re
+
+# The 3-cone view fits 5 characters per line, 2 lines per flavor
+# (format_flavor_for_display's max_chars in tidbyt/culvers_fotd.star).
+MAX_LINE = 5
+
+# Abbreviation map from the device formatter, in the same order. Applied
+# here in one pass via an alternation regex (longest key first), which is
+# equivalent to the device's sequential replaces because no key occurs in
+# another key's replacement text.
+ABBREVIATIONS = {
+    "Chocolate": "Choc",
+    "Caramel": "Crml",
+    "Raspberry": "Rasp",
+    "Strawberry": "Straw",
+    "Cappuccino": "Capp",
+    "Peanut Butter": "PB",
+    "Explosion": "Expl",
+    "Crumble": "Crumb",
+    "Midnight": "Midn",
+    "Brownie": "Brown",
+    "Batter": "Batt",
+    "Toffee": "Toff",
+    "Salted": "Salt",
+    "Cookie": "Cook",
+    "Crazy for": "Crazy4",
+    "Dark": "Dk",
+    "Double": "Dbl",
+    "Triple": "Trpl",
+    "Covered": "Covr",
+    "Cheesecake": "Chees",
+    "Avalanche": "Avlnc",
+    "Volcano": "Volc",
+    "Decadence": "Decad",
+    "Turtle": "Turtl",
+    "Crunch": "Crunc",
+    "Cashew": "Cashw",
+    "Butter": "Buttr",
+}
+
+_ABBREV_RE = re.compile(
+    "|".join(re.escape(k) for k in sorted(ABBREVIATIONS, key=len, reverse=True))
+)
+
+# Base-noun whitelist (abbreviated forms) from the device: line 2 anchors
+# on the base noun, line 1 carries the descriptors.
+BASE_NOUNS = frozenset({
+    "Avlnc", "Volc", "Chees", "Flury", "Cake", "Crumb",
+    "Bliss", "Ovld", "Dough", "Pecan", "Cashw", "Fudge", "Crml",
+    "Choc", "Expl", "Delit", "Dream", "Swirl", "Crunc",
+    "Cook", "Brown", "Twist", "Turtl", "Mint", "Toff", "Decad",
+    "Straw", "PBcup", "Dove",
+})
+
+TWO_WORD_BASE_NOUNS = ("Cook Dough", "Layer Cake", "Batt Bliss")
+
+SAMPLE_FLAVORS = [
+    "Andes Mint Avalanche",
+    "Blackberry Cobbler",
+    "Brownie Thunder",
+    "Butter Pecan",
+    "Caramel Cashew",
+    "Caramel Fudge Cookie Dough",
+    "Chocolate Caramel Twist",
+    "Chocolate Heath Crunch",
+    "Chocolate Volcano",
+    "Crazy for Cookie Dough",
+    "Dark Chocolate Decadence",
+    "Dark Chocolate PB Crunch",
+    "Georgia Peach Pecan",
+    "Lemon Berry Layer Cake",
+    "Mint Explosion",
+    "OREO Cookies and Cream",
+    "Peanut Butter Cup",
+    "Raspberry Cheesecake",
+    "Salted Caramel Pecan Pie",
+    "Turtle Cheesecake",
+]
+
+
+@functools.lru_cache(maxsize=512)
+def format_flavor_for_display(name: str) -> tuple[str, ...]:
+    """Abbreviate a flavor name and wrap it onto up to two display lines.
+
+    Pure and string-keyed, so results are memoized — the render path
+    re-formats the same three flavors every refresh. Returns a tuple so
+    the cached value is immutable; use .cache_clear() in tests.
+    """
+    # Hand-tuned flavors, mirrored from the device line-for-line, quirks
+    # included: the Oreo lower() check can never match (capital O), so
+    # OREO names fall through to the general path on-device too.
+    if "Dark Chocolate PB Crunch" in name or "Dk Choc PB Crunch" in name:
+        return ("DK PB", "Crunc")
+    if "OREO Cookie Cheesecake" in name or "Oreo" in name.lower():
+        if "Cheesecake" in name:
+            return ("Oreo", "Chees")
+        return ("Oreo", "Cook")
+    if "Chocolate Covered Strawberry" in name:
+        return ("Choc", "Straw")
+    if "Devil's Food Cake" in name or "Devils Food Cake" in name:
+        return ("Devil", "Cake")
+    if "Snickers" in name:
+        return ("Snkrs", "Swirl")
+    if "Georgia Peach" in name:
+        return ("GA", "Peach")
+    if "Really Reese" in name or "Reese" in name:
+        return ("Reese",)
+    if "Turtle Cheesecake" in name:
+        return ("Turtl", "Chees")
+    if "Turtle Dove" in name:
+        return ("Turtl", "Dove")
+    if "Caramel Turtle" in name:
+        return ("Crml", "Turtl")
+    if "Butter Pecan" in name:
+        return ("Buttr", "Pecan")
+    if "Caramel Cashew" in name:
+        return ("Crml", "Cashw")
+    if "Andes Mint Avalanche" in name:
+        return ("Mint", "Avlnc")
+    if "Chocolate Volcano" in name or "Choc Volcano" in name:
+        return ("Choc", "Volc")
+    if "Chocolate Decadence" in name or "Choc Decadence" in name:
+        return ("Choc", "Decad")
+    if "Chocolate Heath Crunch" in name or "Choc Heath Crunch" in name:
+        return ("Heath", "Crunc")
+    if "Caramel Fudge Cookie Dough" in name or "Crml Fudge Cook Dough" in name:
+        return ("Fudge", "Dough")
+    if "Salted Double Caramel Pecan" in name or "Salt Dbl Crml Pecan" in name:
+        return ("Salt", "Pecan")
+    if name == "Turtle":
+        return ("Turtl",)
+
+    abbreviated = _ABBREV_RE.sub(lambda m: ABBREVIATIONS[m.group(0)], name)
+    words = abbreviated.split()
+    if not words:
+        return ("???",)
+
+    # Anchored split, as on the device: the base noun holds line 2 and
+    # the descriptors fill line 1, dropping the leading (least salient)
+    # descriptor before truncating when they run long.
+    if words[-1] in BASE_NOUNS:
+        base_noun = words[-1]
+        desc_words = words[:-1]
+    elif len(words) >= 2:
+        two_word = " ".join(words[-2:])
+        if two_word in TWO_WORD_BASE_NOUNS:
+            base_noun = two_word
+            desc_words = words[:-2]
+        else:
+            base_noun = words[-1]
+            desc_words = words[:-1]
+    else:
+        return (words[0][:MAX_LINE],)
+
+    line1 = " ".join(desc_words)
+    line2 = base_noun
+
+    if len(line1) > MAX_LINE:
+        if len(desc_words) > 1:
+            line1 = " ".join(desc_words[1:])
+        if len(line1) > MAX_LINE:
+            line1 = line1[:MAX_LINE]
+    if len(line2) > MAX_LINE:
+        line2 = line2[:MAX_LINE]
+
+    if line1 and line2:
+        return (line1, line2)
+    if line2:
+        return (line2,)
+    return (name[:MAX_LINE],)
+
+
+def format_flavors_batch(names: list[str]) -> list[tuple[str, str]]:
+    """Format many flavor names at once, one (line1, line2) pair per name.
+
+    Multi-day renders format a whole calendar of titles in one shot;
+    this keeps that a single pass over the memoized per-name formatter
+    and normalizes every result to a two-line pair (line2 may be empty),
+    so callers can zip it straight onto display rows.
+    """
+    out = []
+    for name in names:
+        lines = format_flavor_for_display(name)
+        out.append((lines[0], lines[1] if len(lines) > 1 else ""))
+    return out
+
+
+def main():
+    print(f"{'flavor':<28} {'line 1':<7} {'line 2':<7}")
+    print("-" * 44)
+    pairs = format_flavors_batch(SAMPLE_FLAVORS)
+    for flavor, (line1, line2) in zip(SAMPLE_FLAVORS, pairs):
+        print(f"{flavor:<28} {line1:<7} {line2:<7}")
+
+
+if __name__ == "__main__":
+    main()